@@ -1,5 +1,6 @@
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import type { Id } from "./_generated/dataModel";
 
 /**
  * Create a new manga entry
@@ -108,6 +109,62 @@ export const addVolume = mutation({
   },
 });
 
+/**
+ * Add several volumes to a manga in a single transaction.
+ * With skipExisting, volumes that already exist are left alone and get a null id.
+ */
+export const addVolumes = mutation({
+  args: {
+    mangaId: v.id("manga"),
+    volumes: v.array(
+      v.object({
+        volumeNumber: v.number(),
+        pageCount: v.number(),
+        chapterRange: v.optional(v.string()),
+      })
+    ),
+    skipExisting: v.optional(v.boolean()),
+  },
+  returns: v.array(v.union(v.id("volumes"), v.null())),
+  handler: async (ctx, args) => {
+    // Verify manga exists
+    const manga = await ctx.db.get(args.mangaId);
+    if (!manga) {
+      throw new Error("Manga not found");
+    }
+
+    const volumeIds: (Id<"volumes"> | null)[] = [];
+    for (const volume of args.volumes) {
+      // Check if volume already exists for this manga
+      const existing = await ctx.db
+        .query("volumes")
+        .withIndex("by_manga_and_number", (q) =>
+          q.eq("mangaId", args.mangaId).eq("volumeNumber", volume.volumeNumber)
+        )
+        .unique();
+
+      if (existing) {
+        if (args.skipExisting) {
+          volumeIds.push(null);
+          continue;
+        }
+        throw new Error(`Volume ${volume.volumeNumber} already exists for this manga`);
+      }
+
+      volumeIds.push(
+        await ctx.db.insert("volumes", {
+          mangaId: args.mangaId,
+          volumeNumber: volume.volumeNumber,
+          pageCount: volume.pageCount,
+          chapterRange: volume.chapterRange,
+        })
+      );
+    }
+
+    return volumeIds;
+  },
+});
+
 /**
  * Update a volume's page count
  */
@@ -140,6 +197,67 @@ export const updateVolume = mutation({
   },
 });
 
+/**
+ * Add and/or update several volumes of a manga in a single transaction
+ */
+export const bulkUpsertVolumes = mutation({
+  args: {
+    mangaId: v.id("manga"),
+    volumes: v.array(
+      v.object({
+        volumeNumber: v.number(),
+        pageCount: v.number(),
+        action: v.union(v.literal("add"), v.literal("update")),
+      })
+    ),
+  },
+  returns: v.object({
+    added: v.number(),
+    updated: v.number(),
+  }),
+  handler: async (ctx, args) => {
+    // Verify manga exists
+    const manga = await ctx.db.get(args.mangaId);
+    if (!manga) {
+      throw new Error("Manga not found");
+    }
+
+    let added = 0;
+    let updated = 0;
+
+    for (const volume of args.volumes) {
+      const existing = await ctx.db
+        .query("volumes")
+        .withIndex("by_manga_and_number", (q) =>
+          q.eq("mangaId", args.mangaId).eq("volumeNumber", volume.volumeNumber)
+        )
+        .unique();
+
+      if (volume.action === "add") {
+        if (existing) {
+          throw new Error(`Volume ${volume.volumeNumber} already exists for this manga`);
+        }
+        await ctx.db.insert("volumes", {
+          mangaId: args.mangaId,
+          volumeNumber: volume.volumeNumber,
+          pageCount: volume.pageCount,
+        });
+        added++;
+      } else {
+        if (!existing) {
+          throw new Error(`Volume ${volume.volumeNumber} not found for this manga`);
+        }
+        await ctx.db.patch(existing._id, {
+          pageCount: volume.pageCount,
+        });
+        updated++;
+      }
+    }
+
+    return { added, updated };
+  },
+});
+
 /**
  * Get all manga (list view)
  */
@@ -7,13 +7,20 @@ Usage:
     uv run update_volume_pages.py --slug steel-ball-run
 """
 
+import csv
+import functools
+import gzip
 import os
 import re
+from collections import Counter
+from itertools import groupby
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
+from urllib.parse import unquote
 
 import boto3
 import typer
+from botocore.config import Config
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.panel import Panel
@@ -36,12 +43,20 @@ else:
     convex_client = None
 
 
+# getMangaBySlug responses keyed by slug
+_manga_cache: dict[str, Optional[dict]] = {}
+
+# Matches "volume-{NNN}/" right after the "manga/{slug}/" prefix
+_VOLUME_RE = re.compile(r"volume-(\d+)/")
+
+
 def pad_number(num: int, length: int = 3) -> str:
     return str(num).zfill(length)
 
 
+@functools.lru_cache(maxsize=1)
 def get_r2_client():
-    """Create and return R2 S3 client."""
+    """Create and return R2 S3 client (built once per process)."""
     access_key = os.getenv("R2_ACCESS_KEY_ID")
     secret_key = os.getenv("R2_SECRET_ACCESS_KEY")
     bucket_url = os.getenv("R2_BUCKET_URL")
@@ -55,13 +70,57 @@ def get_r2_client():
         endpoint_url=bucket_url,
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
+        config=Config(
+            max_pool_connections=32,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
     )
 
 
-def list_volume_folders(slug: str) -> list[Tuple[int, int]]:
+def iter_volume_numbers(keys: Iterable[str], manga_prefix: str) -> Iterator[int]:
+    """Yield the volume number of every key under manga_prefix/volume-{NNN}/."""
+    prefix_len = len(manga_prefix)
+
+    for key in keys:
+        if not key.startswith(manga_prefix):
+            continue
+        # Match "volume-{NNN}/" just past the "manga/{slug}/" prefix
+        match = _VOLUME_RE.match(key, prefix_len)
+        if match:
+            yield int(match.group(1))
+
+
+def count_volume_files(keys: Iterable[str], manga_prefix: str) -> list[Tuple[int, int]]:
+    """
+    Group object keys under manga_prefix by volume number and count them.
+    Returns (volume_number, file_count) tuples sorted by volume number.
+    """
+    file_counts = Counter(iter_volume_numbers(keys, manga_prefix))
+
+    # Sort by volume number
+    return sorted(file_counts.items())
+
+
+def iter_listing_keys(pages: Iterable[dict], prefix: str) -> Iterator[str]:
+    """Yield object keys from list_objects_v2 pages, failing loudly on truncation."""
+    for page in pages:
+        for obj in page.get("Contents", []):
+            yield obj["Key"]
+
+        # The paginator stops when no continuation token comes back, so a
+        # truncated page without one would silently undercount the volumes
+        if page.get("IsTruncated") and not page.get("NextContinuationToken"):
+            raise ValueError(
+                f"Listing truncated for {prefix} but no continuation token was returned"
+            )
+
+
+def iter_volume_folders(slug: str) -> Iterator[Tuple[int, int]]:
     """
-    List all volume folders in R2 and return (volume_number, file_count) tuples.
-    Returns sorted by volume number.
+    Stream (volume_number, file_count) tuples from the R2 listing.
+
+    Keys come back in lexicographic order, so each volume's files are
+    contiguous and a volume is yielded as soon as the listing moves past it.
     """
     s3_client = get_r2_client()
     if not s3_client:
@@ -71,95 +130,82 @@ def list_volume_folders(slug: str) -> list[Tuple[int, int]]:
     manga_prefix = f"manga/{slug}/"
 
     try:
-        # List all objects under the manga slug
-        response = s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=manga_prefix, Delimiter="/"
+        # One flat listing of the whole slug instead of one listing per volume
+        paginator = s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket_name,
+            Prefix=manga_prefix,
+            PaginationConfig={"PageSize": 1000},
         )
 
-        volumes = []
+        keys = iter_listing_keys(pages, manga_prefix)
+        for vol_num, files in groupby(iter_volume_numbers(keys, manga_prefix)):
+            yield vol_num, sum(1 for _ in files)
 
-        # Find all volume-{NNN} folders
-        for prefix in response.get("CommonPrefixes", []):
-            folder = prefix.get("Prefix", "")
-            # Extract volume number from "manga/{slug}/volume-{NNN}/"
-            match = re.search(r"volume-(\d+)/", folder)
-            if match:
-                vol_num = int(match.group(1))
+    except Exception as e:
+        raise ValueError(f"Failed to list R2 folders: {e}")
 
-                # Count files in this volume
-                vol_response = s3_client.list_objects_v2(
-                    Bucket=bucket_name, Prefix=folder
-                )
 
-                file_count = len(vol_response.get("Contents", []))
-                volumes.append((vol_num, file_count))
+def read_inventory_volumes(inventory_path: Path, slug: str) -> list[Tuple[int, int]]:
+    """
+    Count volume files from an S3 Inventory-style CSV (bucket,key,...) instead
+    of listing the bucket. Accepts plain or gzipped CSV with URL-encoded keys.
+    """
+    if not inventory_path.exists():
+        raise ValueError(f"Inventory file does not exist: {inventory_path}")
 
-        # Sort by volume number
-        volumes.sort(key=lambda x: x[0])
-        return volumes
+    opener = gzip.open if inventory_path.suffix == ".gz" else open
 
-    except Exception as e:
-        raise ValueError(f"Failed to list R2 folders: {e}")
+    try:
+        with opener(inventory_path, "rt", newline="") as f:
+            keys = (unquote(row[1]) for row in csv.reader(f) if len(row) > 1)
+            return count_volume_files(keys, f"manga/{slug}/")
+    except (OSError, csv.Error) as e:
+        raise ValueError(f"Failed to read inventory {inventory_path}: {e}")
 
 
 def get_manga_by_slug(slug: str) -> Optional[dict]:
-    """Get manga from database by slug using getMangaBySlug API."""
+    """Get manga from database by slug using getMangaBySlug API.
+
+    Successful responses are cached per slug for the rest of the process.
+    """
     if not convex_client:
         return None
 
+    if slug in _manga_cache:
+        return _manga_cache[slug]
+
     try:
         # Use getMangaBySlug to get manga with volumes
         result = convex_client.query("manga:getMangaBySlug", {"slug": slug})
+        _manga_cache[slug] = result
         return result
     except Exception as e:
         console.print(f"[red]Error fetching manga: {e}[/red]")
         return None
 
 
-def get_volumes_for_manga(slug: str) -> dict[int, dict]:
-    """Get all volumes for a manga from database.
+def bulk_upsert_volumes(
+    manga_id: str, changes: list[Tuple[int, int, str]]
+) -> dict[str, int]:
+    """Apply all (volume_number, page_count, action) changes in one mutation.
 
-    Returns dict mapping volume_number -> volume data (including pageCount)
+    Returns {"added": n, "updated": n}
     """
-    volumes_data = {}
-
     if not convex_client:
-        return volumes_data
-
-    try:
-        manga = convex_client.query("manga:getMangaBySlug", {"slug": slug})
-        if manga and "volumes" in manga:
-            for volume in manga["volumes"]:
-                vol_num = volume.get("volumeNumber")
-                if vol_num is not None:
-                    volumes_data[vol_num] = volume
-        return volumes_data
-    except Exception as e:
-        console.print(f"[red]Error fetching volumes: {e}[/red]")
-        return volumes_data
-
-
-def update_volume_page_count(
-    manga_id: str, volume_number: int, page_count: int
-) -> bool:
-    """Update page count for a volume."""
-    if not convex_client:
-        return False
-
-    try:
-        # Try to use updateVolume mutation
-        result = convex_client.mutation(
-            "manga:updateVolume",
-            {
-                "mangaId": manga_id,
-                "volumeNumber": volume_number,
-                "pageCount": page_count,
-            },
-        )
-        return True
-    except Exception as e:
-        console.print(f"[yellow]Note: {e}[/yellow]")
-        return False
+        raise ValueError("Convex client not initialized")
+
+    result = convex_client.mutation(
+        "manga:bulkUpsertVolumes",
+        {
+            "mangaId": manga_id,
+            "volumes": [
+                {"volumeNumber": vol_num, "pageCount": page_count, "action": action}
+                for vol_num, page_count, action in changes
+            ],
+        },
+    )
+    return result
 
 
 @app.command()
@@ -171,6 +217,11 @@ def main(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Show what would be updated without making changes"
     ),
+    inventory: Optional[str] = typer.Option(
+        None,
+        "--inventory",
+        help="Read R2 file counts from an inventory CSV (.csv/.csv.gz) instead of listing the bucket",
+    ),
 ):
     """Update volume page counts in database from R2 bucket structure"""
 
@@ -186,7 +237,8 @@ def main(
             Text.from_markup(
                 f"[bold blue]Update Volume Pages[/bold blue]\n"
                 f"Slug: {slug}\n"
-                f"Mode: {'Dry Run' if dry_run else 'Update'}"
+                f"Mode: {'Dry Run' if dry_run else 'Update'}\n"
+                f"R2 Source: {inventory or 'Bucket listing'}"
             ),
             title="Configuration",
             border_style="blue",
@@ -222,23 +274,32 @@ def main(
     console.print("\n[bold]Step 2: Scanning R2 Bucket[/bold]")
 
     try:
-        r2_volumes = list_volume_folders(slug)
+        # Index R2 file counts by volume number for constant-time lookup
+        if inventory:
+            r2_by_num = dict(read_inventory_volumes(Path(inventory), slug))
+        else:
+            r2_by_num = dict(iter_volume_folders(slug))
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
 
-    if not r2_volumes:
+    if not r2_by_num:
         console.print(f"[red]No volumes found in R2 for slug '{slug}'[/red]")
         raise typer.Exit(1)
 
-    console.print(f"[green]Found {len(r2_volumes)} volumes in R2[/green]")
+    console.print(f"[green]Found {len(r2_by_num)} volumes in R2[/green]")
 
     # ============================================================================
     # STEP 3: Get database volumes with page counts
     # ============================================================================
     console.print("\n[bold]Step 3: Fetching Database Volumes[/bold]")
 
-    db_volumes = get_volumes_for_manga(slug)
+    # Reuse the volumes already returned by getMangaBySlug in Step 1
+    db_volumes = {
+        volume["volumeNumber"]: volume
+        for volume in volumes_data
+        if volume.get("volumeNumber") is not None
+    }
     console.print(f"[green]Found {len(db_volumes)} volumes in database[/green]")
 
     # Build dict of {volume_number: page_count} from database
@@ -247,6 +308,11 @@ def main(
         for vol_num, vol_data in db_volumes.items()
     }
 
+    # Fast path: the same volumes with the same page counts on both sides
+    if r2_by_num == db_volume_pages:
+        console.print("\n[green]All volumes are up to date! No changes needed.[/green]")
+        raise typer.Exit(0)
+
     # ============================================================================
     # STEP 4: Compare R2 vs Database
     # ============================================================================
@@ -270,12 +336,10 @@ def main(
     unexpected_volumes = []
 
     # Get all unique volume numbers from both sources
-    all_volumes = set(vol_num for vol_num, _ in r2_volumes) | set(
-        db_volume_pages.keys()
-    )
+    all_volumes = r2_by_num.keys() | db_volume_pages.keys()
 
     for vol_num in sorted(all_volumes):
-        r2_count = next((count for v, count in r2_volumes if v == vol_num), None)
+        r2_count = r2_by_num.get(vol_num)
         db_count = db_volume_pages.get(vol_num, None)
 
         if r2_count is not None and db_count is not None:
@@ -348,12 +412,9 @@ def main(
     # STEP 5: Confirm and proceed
     # ============================================================================
     if not yes:
-        confirm = (
-            input(f"\nProceed with updating {len(changes_needed)} volumes? [Y/n]: ")
-            .strip()
-            .upper()
-        )
-        if confirm in ["N", "NO"]:
+        if not typer.confirm(
+            f"\nProceed with updating {len(changes_needed)} volumes?", default=True
+        ):
             console.print("[red]Operation cancelled.[/red]")
             raise typer.Exit(0)
 
@@ -364,7 +425,6 @@ def main(
 
     updated = 0
     added = 0
-    skipped = 0
     failed = 0
 
     with Progress(
@@ -372,49 +432,26 @@ def main(
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        task = progress.add_task("Processing volumes...", total=len(changes_needed))
+        progress.add_task(f"Updating {len(changes_needed)} volumes...", total=None)
 
+        try:
+            result = bulk_upsert_volumes(manga_id, changes_needed)
+            added = result.get("added", 0)
+            updated = result.get("updated", 0)
+        except Exception as e:
+            console.print(f"[red]  ✗ Update failed, no volumes changed - {e}[/red]")
+            failed = len(changes_needed)
+
+    if not failed:
         for vol_num, file_count, action in changes_needed:
-            progress.update(task, description=f"Processing Volume {vol_num}...")
-
-            try:
-                if action == "add":
-                    # Add new volume
-                    result = convex_client.mutation(
-                        "manga:addVolume",
-                        {
-                            "slug": slug,
-                            "volumeNumber": vol_num,
-                            "pageCount": file_count,
-                        },
-                    )
-                    console.print(
-                        f"[green]  + Volume {vol_num}: Added ({file_count} pages)[/green]"
-                    )
-                    added += 1
-
-                elif action == "update":
-                    # Update existing volume
-                    success = update_volume_page_count(manga_id, vol_num, file_count)
-                    if success:
-                        console.print(
-                            f"[green]  ↑ Volume {vol_num}: Updated to {file_count} pages[/green]"
-                        )
-                        updated += 1
-                    else:
-                        console.print(
-                            f"[yellow]  ! Volume {vol_num}: Update not supported by API[/yellow]"
-                        )
-                        skipped += 1
-
-            except Exception as e:
-                console.print(f"[red]  ✗ Volume {vol_num}: Failed - {e}[/red]")
-                failed += 1
-                if failed >= 3:  # Stop after 3 failures
-                    console.print("[red]Too many failures, stopping.[/red]")
-                    break
-
-            progress.update(task, advance=1)
+            if action == "add":
+                console.print(
+                    f"[green]  + Volume {vol_num}: Added ({file_count} pages)[/green]"
+                )
+            else:
+                console.print(
+                    f"[green]  ↑ Volume {vol_num}: Updated to {file_count} pages[/green]"
+                )
 
     # ============================================================================
     # FINAL SUMMARY
@@ -428,11 +465,6 @@ def main(
         f"  [green]Added: {added} volumes[/green]\n"
     )
 
-    if skipped > 0:
-        summary_text += (
-            f"  [yellow]Skipped: {skipped} volumes (API limitation)[/yellow]\n"
-        )
-
     if failed > 0:
         summary_text += f"  [red]Failed: {failed} volumes[/red]\n"
 
@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 
 
+import functools
+import io
 import os
 import re
+from collections import Counter
 from pathlib import Path
-from typing import Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, Optional
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 
 import boto3
 import typer
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from dotenv import load_dotenv
 from PIL import Image
 from rich.console import Console
@@ -24,6 +35,25 @@ from rich.progress import (
 from rich.table import Table
 from convex import ConvexClient
 
+# Optional: libvips decodes/encodes much faster than Pillow when installed
+try:
+    import pyvips
+
+    USE_VIPS = True
+except (ImportError, OSError):
+    USE_VIPS = False
+
+# Optional: botocore only computes CRC32C through the AWS CRT bindings
+try:
+    import awscrt  # noqa: F401
+
+    CHECKSUM_ALGORITHM = "CRC32C"
+except ImportError:
+    CHECKSUM_ALGORITHM = "CRC32"
+
+# Source pages are local scans, so skip Pillow's decompression-bomb check
+Image.MAX_IMAGE_PIXELS = None
+
 # Load environment variables
 load_dotenv()
 
@@ -37,35 +67,52 @@ if CONVEX_URL:
 else:
     convex_client = None
 
+# Shared transfer settings: multipart for large pages, concurrent part uploads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
+# Object metadata sent with every page upload
+EXTRA_ARGS = {
+    "ContentType": "image/webp",
+    "CacheControl": "public, max-age=31536000, immutable",
+    "ChecksumAlgorithm": CHECKSUM_ALGORITHM,
+}
+
+# Volume folder name pattern: v01, vol 01, volume_01, vol-01, or just a number
+_VOLUME_RE = re.compile(r"v(?:ol)?(?:ume)?[_\s-]*(\d+)|^\s*(\d+)\s*$", re.IGNORECASE)
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+# Source page extensions, compared case-insensitively
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg"}
+
 
 def pad_number(num: int, length: int = 3) -> str:
     return str(num).zfill(length)
 
 
 def extract_volume_number(folder_name: str) -> int:
-    """Extract volume number from folder name using multiple patterns."""
-    patterns = [
-        r"v(?:ol)?(?:ume)?\s*(\d+)",  # v01, vol01, volume01, v 01, vol 01, volume 01
-        r"volume[_\s-]*(\d+)",  # volume_01, volume-01
-        r"vol[_\s-]*(\d+)",  # vol_01, vol-01
-        r"^\s*(\d+)\s*$",  # just a number
-    ]
-
-    folder_lower = folder_name.lower()
-    for pattern in patterns:
-        match = re.search(pattern, folder_lower, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
+    """Extract volume number from folder name, or 0 if it has none."""
+    match = _VOLUME_RE.search(folder_name)
+    if match:
+        return int(match.group(1) or match.group(2))
     return 0
 
 
 def generate_slug(title: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", title.lower())
+    slug = _SLUG_RE.sub("-", title.lower())
     return slug.strip("-")
 
 
-def find_volume_folders(source_path: Path) -> list[tuple[int, Path]]:
-    """Find all volume folders and return (volume_number, path) tuples sorted by volume number."""
+def find_volume_folders(source_path: Path) -> list[tuple[int, Path, list[Path]]]:
+    """Find all volume folders and return (volume_number, path, image_files) tuples.
+
+    Sorted by volume number. Each volume's images are scanned once here and
+    reused by the later steps.
+    """
     volumes = []
 
     if not source_path.exists():
@@ -75,65 +122,171 @@ def find_volume_folders(source_path: Path) -> list[tuple[int, Path]]:
         if entry.is_dir():
             vol_num = extract_volume_number(entry.name)
             if vol_num > 0:
-                volumes.append((vol_num, entry))
+                volumes.append((vol_num, entry, find_image_files(entry)))
 
     # Sort by volume number
     volumes.sort(key=lambda x: x[0])
     return volumes
 
 
+def iter_image_files(directory: str) -> Iterator[str]:
+    """Walk directory once with os.scandir, yielding image file paths as strings."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_image_files(entry.path)
+            elif entry.name.rpartition(".")[2].lower() in IMAGE_EXTENSIONS:
+                yield entry.path
+
+
 def find_image_files(directory: Path) -> list[Path]:
     """Find all image files (PNG, JPG, JPEG) recursively in directory."""
-    image_files = []
-    for ext in ["*.png", "*.jpg", "*.jpeg", "*.PNG", "*.JPG", "*.JPEG"]:
-        image_files.extend(directory.rglob(ext))
-    return sorted(image_files)
+    # Sort by path components, matching the order of sorted() on Path objects
+    image_files = iter_image_files(str(directory))
+    return [Path(p) for p in sorted(image_files, key=lambda p: p.split(os.sep))]
+
+
+def collect_conversion_tasks(
+    volumes: list[tuple[int, Path, list[Path]]],
+    output_path: Path,
+    volume_dirs: dict[int, str],
+    create_folders: bool = True,
+) -> list[tuple[int, Path, Path]]:
+    """Build one (volume_number, image_path, webp_path) conversion task per page."""
+    tasks = []
 
+    for vol_num, vol_path, png_files in volumes:
+        if not png_files:
+            raise ValueError(f"No image files found in {vol_path}")
 
-def count_images_in_volume(vol_path: Path) -> int:
-    """Count all image files recursively in a volume directory."""
-    return len(find_image_files(vol_path))
+        volume_folder = output_path / volume_dirs[vol_num]
+        if create_folders:
+            volume_folder.mkdir(parents=True, exist_ok=True)
 
+        for i, png_path in enumerate(png_files, 1):
+            tasks.append((vol_num, png_path, volume_folder / f"{pad_number(i)}.webp"))
 
-def convert_single_volume(
-    volume_num: int, source_path: Path, output_path: Path, quality: int
-) -> tuple[int, int]:
-    """Convert a single volume from PNG to WebP. Returns (converted_count, errors)."""
-    png_files = find_image_files(source_path)
-    if not png_files:
-        raise ValueError(f"No image files found in {source_path}")
+    return tasks
 
-    volume_folder = output_path / f"volume-{pad_number(volume_num)}"
-    volume_folder.mkdir(parents=True, exist_ok=True)
 
-    converted = 0
-    errors = 0
-    total_files = len(png_files)
+def is_output_current(png_path: Path, output_file: Path) -> bool:
+    """Check whether output_file exists and is at least as new as png_path."""
+    try:
+        return output_file.stat().st_mtime >= png_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
 
-    for i, png_path in enumerate(png_files, 1):
-        output_file = volume_folder / f"{pad_number(i)}.webp"
+class InlineExecutor(Executor):
+    """Executor that runs each task immediately in the calling thread."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
         try:
-            with Image.open(png_path) as img:
-                img.save(output_file, "WEBP", quality=quality, method=6)
-            converted += 1
-            # Print progress every file
-            print(
-                f"  Vol {volume_num}: [{i}/{total_files}] {png_path.name} -> {output_file.name}",
-                flush=True,
-            )
+            future.set_result(fn(*args, **kwargs))
         except Exception as e:
-            errors += 1
-            print(
-                f"  [ERROR] Vol {volume_num}: Failed to convert {png_path.name}: {e}",
-                flush=True,
-            )
-            raise  # Re-raise to stop completely
+            future.set_exception(e)
+        return future
+
+
+def make_executor(
+    executor_class: type[Executor],
+    max_workers: int,
+    task_count: int,
+    initializer=None,
+    initargs: tuple = (),
+) -> Executor:
+    """Create a pool, or an InlineExecutor when there is nothing to parallelize."""
+    if task_count <= 1 or max_workers == 1:
+        if initializer:
+            initializer(*initargs)
+        return InlineExecutor()
+
+    return executor_class(
+        max_workers=max_workers, initializer=initializer, initargs=initargs
+    )
+
 
-    return converted, errors
+def init_pool_worker(with_r2: bool = False) -> None:
+    """Warm up a pool worker process before it receives its first task."""
+    # Register Pillow's format plugins now instead of on the first Image.open
+    Image.init()
+    if with_r2:
+        # Build this process's cached R2 client and connection pool up front
+        get_r2_client()
+
+
+def encode_page(
+    png_path: Path, quality: int, method: int = 4, lossless: bool = False
+) -> bytes:
+    """Encode a single page to WebP in memory.
+
+    For lossless output, quality is the encoder effort (0 = fastest, 100 = smallest).
+    Uses libvips when pyvips is installed, otherwise Pillow.
+    """
+    if USE_VIPS:
+        image = pyvips.Image.new_from_file(str(png_path), access="sequential")
+        return image.webpsave_buffer(Q=quality, effort=method, lossless=lossless)
+
+    buffer = io.BytesIO()
+    with Image.open(png_path) as img:
+        img.save(
+            buffer,
+            "WEBP",
+            quality=quality,
+            method=method,
+            lossless=lossless,
+        )
+    return buffer.getvalue()
+
+
+def convert_single_page(
+    png_path: Path,
+    output_file: Path,
+    quality: int,
+    method: int = 4,
+    lossless: bool = False,
+) -> None:
+    """Convert a single page to a WebP file."""
+    output_file.write_bytes(encode_page(png_path, quality, method, lossless))
+
+
+def convert_and_upload_page(
+    png_path: Path,
+    key: str,
+    output_file: Optional[Path],
+    quality: int,
+    method: int = 4,
+    lossless: bool = False,
+) -> None:
+    """Encode a single page in memory and upload it straight to R2.
+
+    The WebP is only written to disk as well when output_file is given.
+    """
+    data = encode_page(png_path, quality, method, lossless)
+    if output_file is not None:
+        output_file.write_bytes(data)
 
+    s3_client = get_r2_client()
+    if not s3_client:
+        raise ValueError("R2 credentials not configured")
 
-def get_r2_client():
-    """Create and return R2 S3 client."""
+    s3_client.upload_fileobj(
+        io.BytesIO(data),
+        os.getenv("R2_BUCKET_NAME", "manga"),
+        key,
+        ExtraArgs=EXTRA_ARGS,
+        Config=TRANSFER_CONFIG,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_r2_client(max_pool_connections: int = 32):
+    """Create and return R2 S3 client (built once per process).
+
+    boto3's default pool of 10 connections would make upload threads queue
+    for a connection, so size it for the callers sharing this client.
+    """
     access_key = os.getenv("R2_ACCESS_KEY_ID")
     secret_key = os.getenv("R2_SECRET_ACCESS_KEY")
     bucket_url = os.getenv("R2_BUCKET_URL")
@@ -147,48 +300,61 @@ def get_r2_client():
         endpoint_url=bucket_url,
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=max_pool_connections,
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
     )
 
 
-def upload_single_volume_to_r2(
-    volume_num: int, webp_folder: Path, manga_slug: str
-) -> tuple[int, int]:
-    """Upload a single volume to R2. Returns (uploaded_count, errors)."""
-    s3_client = get_r2_client()
-    if not s3_client:
-        raise ValueError("R2 credentials not configured")
+def collect_upload_tasks(
+    volumes: list[tuple[int, Path, list[Path]]],
+    output_base: Path,
+    manga_slug: str,
+    volume_dirs: dict[int, str],
+) -> list[tuple[int, str, str]]:
+    """Build one (volume_number, webp_path, r2_key) upload task per page.
 
-    bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
-    webp_files = sorted(webp_folder.glob("*.webp"))
+    Page names are zero-padded, so a plain string sort keeps them in order.
+    """
+    tasks = []
 
-    if not webp_files:
-        raise ValueError(f"No WebP files found in {webp_folder}")
+    for vol_num, _, _ in volumes:
+        webp_folder = os.path.join(output_base, volume_dirs[vol_num])
+        try:
+            with os.scandir(webp_folder) as it:
+                names = sorted(
+                    e.name
+                    for e in it
+                    if e.name.endswith(".webp") and not e.name.startswith(".")
+                )
+        except FileNotFoundError:
+            names = []
 
-    uploaded = 0
-    errors = 0
-    folder_prefix = f"manga/{manga_slug}/volume-{pad_number(volume_num)}/"
+        if not names:
+            raise ValueError(f"No WebP files found in {webp_folder}")
 
-    for webp_file in webp_files:
-        key = f"{folder_prefix}{webp_file.name}"
-        try:
-            s3_client.upload_file(
-                str(webp_file),
-                bucket_name,
-                key,
-                ExtraArgs={
-                    "ContentType": "image/webp",
-                    "CacheControl": "public, max-age=31536000, immutable",
-                },
-            )
-            uploaded += 1
-        except Exception as e:
-            errors += 1
-            console.print(
-                f"[red]Error uploading {webp_file} for Volume {volume_num}: {e}[/red]"
-            )
-            raise  # Re-raise to stop completely
+        folder_prefix = f"manga/{manga_slug}/{volume_dirs[vol_num]}/"
+        for name in names:
+            tasks.append((vol_num, webp_folder + os.sep + name, folder_prefix + name))
+
+    return tasks
 
-    return uploaded, errors
+
+def upload_file_to_r2(s3_client, bucket_name: str, webp_file: str, key: str) -> None:
+    """Upload a single WebP page to R2.
+
+    The boto3 client is shared between upload threads (clients are thread-safe).
+    """
+    s3_client.upload_file(
+        webp_file,
+        bucket_name,
+        key,
+        ExtraArgs=EXTRA_ARGS,
+        Config=TRANSFER_CONFIG,
+    )
 
 
 def create_manga(
@@ -216,27 +382,81 @@ def create_manga(
         raise
 
 
-def add_volume(manga_id: str, volume_number: int, page_count: int) -> str:
-    """Add volume to manga in Convex."""
+def add_volumes(manga_id: str, volume_page_counts: dict[int, int]) -> list[str]:
+    """Add all volumes to manga in Convex with a single mutation."""
     if not convex_client:
         raise ValueError("Convex client not initialized")
 
+    payload = [
+        {"volumeNumber": vol_num, "pageCount": page_count}
+        for vol_num, page_count in sorted(volume_page_counts.items())
+    ]
+
     try:
         result = convex_client.mutation(
-            "manga:addVolume",
-            {
-                "mangaId": manga_id,
-                "volumeNumber": volume_number,
-                "pageCount": page_count,
-            },
+            "manga:addVolumes", {"mangaId": manga_id, "volumes": payload}
         )
-        volume_id = result if isinstance(result, str) else str(result)
-        return volume_id
+        return [str(volume_id) for volume_id in result]
     except Exception as e:
-        console.print(f"[red]Error adding volume {volume_number}: {e}[/red]")
+        console.print(f"[red]Error adding volumes: {e}[/red]")
         raise
 
 
+def add_volume(manga_id: str, volume_number: int, page_count: int) -> str:
+    """Add volume to manga in Convex."""
+    return add_volumes(manga_id, {volume_number: page_count})[0]
+
+
+def confirm_r2_upload(
+    volumes: list[tuple[int, Path, list[Path]]],
+    volume_page_counts: dict[int, int],
+    slug: str,
+    volume_dirs: dict[int, str],
+    yes: bool,
+) -> None:
+    """Show the R2 upload summary and ask for confirmation unless yes is set."""
+    upload_table = Table(
+        title="R2 Upload Summary", show_header=True, header_style="bold magenta"
+    )
+    upload_table.add_column("Volume", style="cyan", justify="right")
+    upload_table.add_column("Files to Upload", style="yellow", justify="right")
+    upload_table.add_column("R2 Path", style="green")
+
+    total_files = 0
+    for vol_num, _, _ in volumes:
+        page_count = volume_page_counts.get(vol_num, 0)
+        total_files += page_count
+        r2_path = f"manga/{slug}/{volume_dirs[vol_num]}/"
+        upload_table.add_row(str(vol_num), str(page_count), r2_path)
+
+    upload_table.add_row("", "", "")
+    upload_table.add_row(
+        "[bold]Total",
+        f"[bold]{total_files}[/bold]",
+        f"[dim]Base: manga/{slug}/[/dim]",
+    )
+
+    console.print(upload_table)
+
+    # Ask for confirmation unless --yes flag is set
+    if not yes:
+        try:
+            confirm = (
+                input(f"\nProceed with uploading {total_files} files to R2? [Y/n]: ")
+                .strip()
+                .upper()
+            )
+
+            # Default to Y if empty, cancel if N
+            if confirm in ["N", "NO"]:
+                console.print("[red]Upload cancelled by user.[/red]")
+                raise typer.Exit(0)
+            # Accept Y, YES, or empty (default Y)
+        except (EOFError, KeyboardInterrupt):
+            console.print("[red]Upload cancelled.[/red]")
+            raise typer.Exit(0)
+
+
 @app.command()
 def main(
     source: str = typer.Option(
@@ -251,18 +471,50 @@ def main(
     output: Optional[str] = typer.Option(
         None, "--output", "-o", help="Output directory for WebP files"
     ),
-    quality: int = typer.Option(85, "--quality", "-q", help="WebP quality (1-100)"),
+    quality: int = typer.Option(
+        85,
+        "--quality",
+        "-q",
+        help="WebP quality (1-100); with --lossless, encoder effort (0 = fastest, 100 = smallest)",
+    ),
+    webp_method: int = typer.Option(
+        4,
+        "--webp-method",
+        min=0,
+        max=6,
+        help="WebP encoder method (0 = fastest, 6 = smallest files but several times slower)",
+    ),
+    lossless: bool = typer.Option(
+        False, "--lossless", help="Encode lossless WebP instead of lossy"
+    ),
     status: str = typer.Option(
         "completed", "--status", help="Manga status (ongoing/completed)"
     ),
     max_workers: int = typer.Option(
-        4, "--max-workers", "-w", help="Maximum parallel workers for processing"
+        os.cpu_count() or 4,
+        "--max-workers",
+        "-w",
+        help="Maximum parallel workers for PNG to WebP conversion",
+    ),
+    upload_workers: int = typer.Option(
+        32, "--upload-workers", help="Maximum concurrent page uploads to R2"
     ),
     skip_convert: bool = typer.Option(
         False,
         "--skip-convert",
         help="Skip PNG to WebP conversion (use existing WebP files)",
     ),
+    pipeline: bool = typer.Option(
+        False,
+        "--pipeline",
+        help="Convert and upload each page in one step from memory (no WebP files "
+        "on disk unless --output is given)",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Re-encode every page even if its WebP file is newer than the source",
+    ),
     skip_r2: bool = typer.Option(
         False, "--skip-r2", help="Skip R2 upload (just convert and add to DB)"
     ),
@@ -289,7 +541,10 @@ def main(
                 f"Slug: {slug}\n"
                 f"Source: {source}\n"
                 f"Max Workers: {max_workers}\n"
-                f"WebP Quality: {quality}"
+                f"Upload Workers: {upload_workers}\n"
+                f"WebP Quality: {quality}\n"
+                f"WebP Method: {webp_method}{' (lossless)' if lossless else ''}\n"
+                f"Encoder: {'libvips' if USE_VIPS else 'Pillow'}"
             ),
             title="Configuration",
             border_style="blue",
@@ -312,12 +567,6 @@ def main(
         console.print(f"[red]No volume folders found in {source_path}[/red]")
         raise typer.Exit(1)
 
-    # Count PNGs in each volume
-    volume_png_counts = {}
-    for vol_num, vol_path in volumes:
-        png_count = count_images_in_volume(vol_path)
-        volume_png_counts[vol_num] = png_count
-
     # Display summary table
     table = Table(
         title=f"Found {len(volumes)} Volumes",
@@ -329,8 +578,8 @@ def main(
     table.add_column("Image Count", style="yellow", justify="right")
 
     total_pngs = 0
-    for vol_num, vol_path in volumes:
-        png_count = volume_png_counts[vol_num]
+    for vol_num, vol_path, png_files in volumes:
+        png_count = len(png_files)
         total_pngs += png_count
         table.add_row(str(vol_num), vol_path.name, str(png_count))
 
@@ -342,15 +591,50 @@ def main(
     output_base = Path(output) if output else Path("./output") / slug
     total_volumes = len(volumes)
 
+    # Padded folder name for each volume, shared by local paths and R2 keys
+    volume_dirs = {
+        vol_num: f"volume-{pad_number(vol_num)}" for vol_num, _, _ in volumes
+    }
+
+    if pipeline and (skip_convert or skip_r2):
+        console.print(
+            "[red]Error: --pipeline can't be combined with --skip-convert or --skip-r2[/red]"
+        )
+        raise typer.Exit(1)
+
     # ============================================================================
     # STEP 2: Convert all volumes in parallel
     # ============================================================================
-    if not skip_convert:
+    if pipeline:
         console.print(
-            f"\n[bold]Step 2: Converting PNG to WebP (parallel, {max_workers} workers)[/bold]"
+            f"\n[bold]Step 2+3: Converting and Uploading to R2 "
+            f"(pipeline, {max_workers} workers)[/bold]"
         )
 
-        volume_page_counts = {}
+        try:
+            convert_tasks = collect_conversion_tasks(
+                volumes, output_base, volume_dirs, create_folders=output is not None
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
+        volume_totals = Counter(vol_num for vol_num, _, _ in convert_tasks)
+        confirm_r2_upload(volumes, dict(volume_totals), slug, volume_dirs, yes)
+
+        if not get_r2_client():
+            console.print("[red]Error: R2 credentials not configured[/red]")
+            raise typer.Exit(1)
+
+        r2_prefixes = {
+            vol_num: f"manga/{slug}/{volume_dir}/"
+            for vol_num, volume_dir in volume_dirs.items()
+        }
+
+        # Pages left per volume, to report each volume as it finishes
+        remaining = volume_totals.copy()
+        volume_page_counts = {vol_num: 0 for vol_num in volume_totals}
+        failed_pages = 0
 
         with Progress(
             SpinnerColumn(),
@@ -359,37 +643,150 @@ def main(
             TaskProgressColumn(),
             console=console,
         ) as progress:
-            task = progress.add_task("Converting volumes...", total=len(volumes))
+            task = progress.add_task(
+                "Converting and uploading pages...", total=len(convert_tasks)
+            )
 
-            with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all conversion tasks
+            with make_executor(
+                ProcessPoolExecutor,
+                max_workers,
+                len(convert_tasks),
+                initializer=init_pool_worker,
+                initargs=(True,),
+            ) as executor:
+                # Submit all fused convert + upload tasks
                 futures = {
                     executor.submit(
-                        convert_single_volume, vol_num, vol_path, output_base, quality
-                    ): vol_num
-                    for vol_num, vol_path in volumes
+                        convert_and_upload_page,
+                        png_path,
+                        r2_prefixes[vol_num] + output_file.name,
+                        output_file if output else None,
+                        quality,
+                        webp_method,
+                        lossless,
+                    ): (vol_num, png_path)
+                    for vol_num, png_path, output_file in convert_tasks
                 }
 
                 # Collect results as they complete
                 for future in as_completed(futures):
-                    vol_num = futures[future]
+                    vol_num, png_path = futures[future]
                     try:
-                        converted, errors = future.result()
-                        volume_page_counts[vol_num] = converted
-                        progress.update(task, advance=1)
+                        future.result()
+                        volume_page_counts[vol_num] += 1
+                    except Exception as e:
+                        failed_pages += 1
+                        console.print(
+                            f"[red]✗ Volume {vol_num}: Failed to process "
+                            f"{png_path.name}: {e}[/red]"
+                        )
+
+                    progress.update(task, advance=1)
+                    remaining[vol_num] -= 1
+                    if remaining[vol_num] == 0:
                         console.print(
-                            f"[green]✓ Volume {vol_num}: {converted} pages converted[/green]"
+                            f"[green]✓ Volume {vol_num}: "
+                            f"{volume_page_counts[vol_num]} pages uploaded[/green]"
                         )
+
+        # Don't add volumes with missing pages to the database
+        if failed_pages:
+            console.print(f"[red]✗ {failed_pages} pages failed to upload[/red]")
+            raise typer.Exit(1)
+    elif not skip_convert:
+        console.print(
+            f"\n[bold]Step 2: Converting PNG to WebP (parallel, {max_workers} workers)[/bold]"
+        )
+
+        try:
+            convert_tasks = collect_conversion_tasks(volumes, output_base, volume_dirs)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
+        # Pages left per volume, to report each volume as it finishes
+        volume_totals = Counter(vol_num for vol_num, _, _ in convert_tasks)
+        remaining = volume_totals.copy()
+        volume_page_counts = {vol_num: 0 for vol_num in volume_totals}
+        failed_pages = 0
+
+        # Reuse WebP files that are already newer than their source page
+        pending_tasks = []
+        for vol_num, png_path, output_file in convert_tasks:
+            if not force and is_output_current(png_path, output_file):
+                volume_page_counts[vol_num] += 1
+                remaining[vol_num] -= 1
+            else:
+                pending_tasks.append((vol_num, png_path, output_file))
+
+        for vol_num in sorted(remaining):
+            if remaining[vol_num] == 0:
+                console.print(
+                    f"[blue]✓ Volume {vol_num}: "
+                    f"{volume_page_counts[vol_num]} pages already up to date[/blue]"
+                )
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Converting pages...", total=len(pending_tasks))
+
+            # One task per page keeps every core busy regardless of volume count
+            with make_executor(
+                ProcessPoolExecutor,
+                max_workers,
+                len(pending_tasks),
+                initializer=init_pool_worker,
+            ) as executor:
+                # Submit all conversion tasks
+                futures = {
+                    executor.submit(
+                        convert_single_page,
+                        png_path,
+                        output_file,
+                        quality,
+                        webp_method,
+                        lossless,
+                    ): (vol_num, png_path)
+                    for vol_num, png_path, output_file in pending_tasks
+                }
+
+                # Collect results as they complete
+                for future in as_completed(futures):
+                    vol_num, png_path = futures[future]
+                    try:
+                        future.result()
+                        volume_page_counts[vol_num] += 1
                     except Exception as e:
-                        console.print(f"[red]✗ Volume {vol_num} failed: {e}[/red]")
-                        raise typer.Exit(1)
+                        failed_pages += 1
+                        console.print(
+                            f"[red]✗ Volume {vol_num}: Failed to convert "
+                            f"{png_path.name}: {e}[/red]"
+                        )
+
+                    progress.update(task, advance=1)
+                    remaining[vol_num] -= 1
+                    if remaining[vol_num] == 0:
+                        console.print(
+                            f"[green]✓ Volume {vol_num}: "
+                            f"{volume_page_counts[vol_num]} pages converted[/green]"
+                        )
+
+        # Don't upload volumes with missing pages
+        if failed_pages:
+            console.print(f"[red]✗ {failed_pages} pages failed to convert[/red]")
+            raise typer.Exit(1)
     else:
         console.print(
             "\n[yellow]Skipping conversion - counting existing WebP files[/yellow]"
         )
         volume_page_counts = {}
-        for vol_num, _ in volumes:
-            volume_output = output_base / f"volume-{pad_number(vol_num)}"
+        for vol_num, _, _ in volumes:
+            volume_output = output_base / volume_dirs[vol_num]
             page_count = len(list(volume_output.glob("*.webp")))
             volume_page_counts[vol_num] = page_count
             console.print(f"  Volume {vol_num}: {page_count} pages found")
@@ -397,55 +794,36 @@ def main(
     # ============================================================================
     # STEP 3: Confirm and Upload all volumes to R2 in parallel
     # ============================================================================
-    if not skip_r2:
+    # With --pipeline, pages were already uploaded during Step 2
+    if not skip_r2 and not pipeline:
         # Show upload summary and ask for confirmation
         console.print("\n[bold]Step 3: R2 Upload Preparation[/bold]")
 
-        upload_table = Table(
-            title="R2 Upload Summary", show_header=True, header_style="bold magenta"
-        )
-        upload_table.add_column("Volume", style="cyan", justify="right")
-        upload_table.add_column("Files to Upload", style="yellow", justify="right")
-        upload_table.add_column("R2 Path", style="green")
-
-        total_files = 0
-        for vol_num, _ in volumes:
-            page_count = volume_page_counts.get(vol_num, 0)
-            total_files += page_count
-            r2_path = f"manga/{slug}/volume-{pad_number(vol_num)}/"
-            upload_table.add_row(str(vol_num), str(page_count), r2_path)
-
-        upload_table.add_row("", "", "")
-        upload_table.add_row(
-            "[bold]Total",
-            f"[bold]{total_files}[/bold]",
-            f"[dim]Base: manga/{slug}/[/dim]",
+        confirm_r2_upload(volumes, volume_page_counts, slug, volume_dirs, yes)
+
+        # One connection per upload thread, plus room for a multipart upload
+        s3_client = get_r2_client(
+            max(32, upload_workers + TRANSFER_CONFIG.max_concurrency)
         )
+        if not s3_client:
+            console.print("[red]Error: R2 credentials not configured[/red]")
+            raise typer.Exit(1)
 
-        console.print(upload_table)
-
-        # Ask for confirmation unless --yes flag is set
-        if not yes:
-            try:
-                confirm = (
-                    input(
-                        f"\nProceed with uploading {total_files} files to R2? [Y/n]: "
-                    )
-                    .strip()
-                    .upper()
-                )
+        bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
+        try:
+            upload_tasks = collect_upload_tasks(
+                volumes, output_base, slug, volume_dirs
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
 
-                # Default to Y if empty, cancel if N
-                if confirm in ["N", "NO"]:
-                    console.print("[red]Upload cancelled by user.[/red]")
-                    raise typer.Exit(0)
-                # Accept Y, YES, or empty (default Y)
-            except (EOFError, KeyboardInterrupt):
-                console.print("[red]Upload cancelled.[/red]")
-                raise typer.Exit(0)
+        # Pages left per volume, to report each volume as it finishes
+        volume_file_counts = Counter(vol_num for vol_num, _, _ in upload_tasks)
+        remaining = volume_file_counts.copy()
 
         console.print(
-            f"\n[bold]Uploading to R2 (parallel, {max_workers} workers)...[/bold]"
+            f"\n[bold]Uploading to R2 (parallel, {upload_workers} workers)...[/bold]"
         )
 
         with Progress(
@@ -455,35 +833,42 @@ def main(
             TaskProgressColumn(),
             console=console,
         ) as progress:
-            task = progress.add_task("Uploading volumes...", total=len(volumes))
+            task = progress.add_task("Uploading pages...", total=len(upload_tasks))
 
-            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Uploads are I/O-bound, so threads avoid process startup and pickling.
+            # Parallelize per page so one large volume can't become the straggler.
+            with make_executor(
+                ThreadPoolExecutor, upload_workers, len(upload_tasks)
+            ) as executor:
                 # Submit all upload tasks
                 futures = {
                     executor.submit(
-                        upload_single_volume_to_r2,
-                        vol_num,
-                        output_base / f"volume-{pad_number(vol_num)}",
-                        slug,
-                    ): vol_num
-                    for vol_num, _ in volumes
+                        upload_file_to_r2, s3_client, bucket_name, webp_file, key
+                    ): (vol_num, webp_file)
+                    for vol_num, webp_file, key in upload_tasks
                 }
 
                 # Collect results as they complete
                 for future in as_completed(futures):
-                    vol_num = futures[future]
+                    vol_num, webp_file = futures[future]
                     try:
-                        uploaded, errors = future.result()
-                        progress.update(task, advance=1)
-                        console.print(
-                            f"[green]✓ Volume {vol_num}: {uploaded} files uploaded[/green]"
-                        )
+                        future.result()
                     except Exception as e:
                         console.print(
-                            f"[red]✗ Volume {vol_num} upload failed: {e}[/red]"
+                            f"[red]✗ Volume {vol_num} upload failed "
+                            f"({os.path.basename(webp_file)}): {e}[/red]"
                         )
+                        executor.shutdown(cancel_futures=True)
                         raise typer.Exit(1)
-    else:
+
+                    progress.update(task, advance=1)
+                    remaining[vol_num] -= 1
+                    if remaining[vol_num] == 0:
+                        console.print(
+                            f"[green]✓ Volume {vol_num}: "
+                            f"{volume_file_counts[vol_num]} files uploaded[/green]"
+                        )
+    elif skip_r2:
         console.print("\n[yellow]Skipping R2 upload[/yellow]")
 
     # ============================================================================
@@ -510,17 +895,18 @@ def main(
             console.print(f"[red]Failed to create manga: {e}[/red]")
             raise typer.Exit(1)
 
-        # Add all volumes
-        for vol_num, _ in volumes:
-            page_count = volume_page_counts.get(vol_num, 0)
-            try:
-                volume_id = add_volume(manga_id, vol_num, page_count)
-                console.print(
-                    f"[green]Added Volume {vol_num} ({page_count} pages)[/green]"
-                )
-            except Exception as e:
-                console.print(f"[red]Failed to add Volume {vol_num}: {e}[/red]")
-                raise typer.Exit(1)
+        # Add all volumes in one round trip
+        page_counts = {
+            vol_num: volume_page_counts.get(vol_num, 0) for vol_num, _, _ in volumes
+        }
+        try:
+            add_volumes(manga_id, page_counts)
+        except Exception as e:
+            console.print(f"[red]Failed to add volumes: {e}[/red]")
+            raise typer.Exit(1)
+
+        for vol_num, page_count in sorted(page_counts.items()):
+            console.print(f"[green]Added Volume {vol_num} ({page_count} pages)[/green]")
     else:
         console.print("\n[yellow]Skipping database operations[/yellow]")
 
@@ -536,7 +922,7 @@ def main(
         f"Volume Details:\n"
     )
 
-    for vol_num, _ in volumes:
+    for vol_num, _, _ in volumes:
         page_count = volume_page_counts.get(vol_num, 0)
         summary_text += f"  Volume {vol_num}: {page_count} pages\n"
 
@@ -7,13 +7,19 @@ Usage:
     uv run upload_manga_to_db.py --slug steel-ball-run --title "Steel Ball Run"
 """
 
+import csv
+import functools
+import gzip
 import os
-import re
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+from urllib.parse import unquote
 
 import boto3
 import typer
+from botocore.config import Config
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.panel import Panel
@@ -35,13 +41,17 @@ if CONVEX_URL:
 else:
     convex_client = None
 
+# listManga results keyed by slug, fetched once per run
+_manga_by_slug: Optional[dict[str, dict]] = None
+
 
 def pad_number(num: int, length: int = 3) -> str:
     return str(num).zfill(length)
 
 
+@functools.lru_cache(maxsize=1)
 def get_r2_client():
-    """Create and return R2 S3 client."""
+    """Create and return R2 S3 client (built once per process)."""
     access_key = os.getenv("R2_ACCESS_KEY_ID")
     secret_key = os.getenv("R2_SECRET_ACCESS_KEY")
     bucket_url = os.getenv("R2_BUCKET_URL")
@@ -55,9 +65,35 @@ def get_r2_client():
         endpoint_url=bucket_url,
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
+        config=Config(
+            max_pool_connections=32,
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
     )
 
 
+def count_volume_files(keys: Iterable[str], manga_prefix: str) -> list[tuple[int, int]]:
+    """
+    Count object keys under manga_prefix by their volume-{NNN} folder.
+    Returns (volume_number, file_count) tuples sorted by volume number.
+    """
+    prefix_len = len(manga_prefix)
+    file_counts = Counter()
+
+    for key in keys:
+        if not key.startswith(manga_prefix):
+            continue
+        # Extract volume number from "manga/{slug}/volume-{NNN}/..." by slicing,
+        # which is much cheaper than a regex search per key
+        folder, sep, _ = key[prefix_len:].partition("/")
+        if sep and folder.startswith("volume-") and folder[7:].isdecimal():
+            file_counts[int(folder[7:])] += 1
+
+    # Sort by volume number
+    return sorted(file_counts.items())
+
+
 def list_volume_folders(slug: str) -> list[tuple[int, int]]:
     """
     List all volume folders in R2 and return (volume_number, file_count) tuples.
@@ -71,48 +107,52 @@ def list_volume_folders(slug: str) -> list[tuple[int, int]]:
     manga_prefix = f"manga/{slug}/"
 
     try:
-        # List all objects under the manga slug
-        response = s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=manga_prefix, Delimiter="/"
+        # One flat listing of the whole slug instead of one listing per volume
+        paginator = s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket_name,
+            Prefix=manga_prefix,
+            PaginationConfig={"PageSize": 1000},
         )
 
-        volumes = []
+        # Only the key of each object is needed to count pages
+        keys = (obj["Key"] for page in pages for obj in page.get("Contents", []))
+        return count_volume_files(keys, manga_prefix)
 
-        # Find all volume-{NNN} folders
-        for prefix in response.get("CommonPrefixes", []):
-            folder = prefix.get("Prefix", "")
-            # Extract volume number from "manga/{slug}/volume-{NNN}/"
-            match = re.search(r"volume-(\d+)/", folder)
-            if match:
-                vol_num = int(match.group(1))
+    except Exception as e:
+        raise ValueError(f"Failed to list R2 folders: {e}")
 
-                # Count files in this volume
-                vol_response = s3_client.list_objects_v2(
-                    Bucket=bucket_name, Prefix=folder
-                )
 
-                file_count = len(vol_response.get("Contents", []))
-                volumes.append((vol_num, file_count))
+def read_inventory_volumes(inventory_path: Path, slug: str) -> list[tuple[int, int]]:
+    """
+    Count volume files from an S3 Inventory-style CSV (bucket,key,...) instead
+    of listing the bucket. Accepts plain or gzipped CSV with URL-encoded keys.
+    """
+    if not inventory_path.exists():
+        raise ValueError(f"Inventory file does not exist: {inventory_path}")
 
-        # Sort by volume number
-        volumes.sort(key=lambda x: x[0])
-        return volumes
+    opener = gzip.open if inventory_path.suffix == ".gz" else open
 
-    except Exception as e:
-        raise ValueError(f"Failed to list R2 folders: {e}")
+    try:
+        with opener(inventory_path, "rt", newline="") as f:
+            keys = (unquote(row[1]) for row in csv.reader(f) if len(row) > 1)
+            return count_volume_files(keys, f"manga/{slug}/")
+    except (OSError, csv.Error) as e:
+        raise ValueError(f"Failed to read inventory {inventory_path}: {e}")
 
 
 def get_existing_manga_by_slug(slug: str) -> Optional[dict]:
     """Check if manga already exists in database by slug."""
+    global _manga_by_slug
+
     if not convex_client:
         return None
 
     try:
-        manga_list = convex_client.query("manga:listManga")
-        for manga in manga_list:
-            if manga.get("slug") == slug:
-                return manga
-        return None
+        if _manga_by_slug is None:
+            manga_list = convex_client.query("manga:listManga")
+            _manga_by_slug = {manga.get("slug"): manga for manga in manga_list}
+        return _manga_by_slug.get(slug)
     except Exception as e:
         console.print(
             f"[yellow]Warning: Could not check for existing manga: {e}[/yellow]"
@@ -147,31 +187,37 @@ def create_manga(
         raise
 
 
-def add_volume(manga_id: str, volume_number: int, page_count: int) -> Optional[str]:
-    """Add volume to manga in Convex. Returns volume_id or None if skipped."""
+def add_volumes(manga_id: str, volumes: list[tuple[int, int]]) -> list[Optional[str]]:
+    """Add all (volume_number, page_count) volumes to manga in one mutation.
+
+    Returns one volume_id per volume, or None where the volume already existed.
+    """
     if not convex_client:
         raise ValueError("Convex client not initialized")
 
     try:
         result = convex_client.mutation(
-            "manga:addVolume",
+            "manga:addVolumes",
             {
                 "mangaId": manga_id,
-                "volumeNumber": volume_number,
-                "pageCount": page_count,
+                "volumes": [
+                    {"volumeNumber": vol_num, "pageCount": page_count}
+                    for vol_num, page_count in volumes
+                ],
+                "skipExisting": True,
             },
         )
-        volume_id = result if isinstance(result, str) else str(result)
-        return volume_id
+        return [None if volume_id is None else str(volume_id) for volume_id in result]
     except Exception as e:
-        error_msg = str(e).lower()
-        # If it's a duplicate error, return None to indicate skip
-        if "already exists" in error_msg or "duplicate" in error_msg:
-            return None
-        console.print(f"[red]Error adding volume {volume_number}: {e}[/red]")
+        console.print(f"[red]Error adding volumes: {e}[/red]")
         raise
 
 
+def add_volume(manga_id: str, volume_number: int, page_count: int) -> Optional[str]:
+    """Add volume to manga in Convex. Returns volume_id or None if skipped."""
+    return add_volumes(manga_id, [(volume_number, page_count)])[0]
+
+
 @app.command()
 def main(
     slug: str = typer.Option(..., "--slug", "-s", help="Manga slug (R2 folder name)"),
@@ -182,7 +228,18 @@ def main(
     cdn_base: str = typer.Option(
         "https://cdn.koushikkoushik.com", "--cdn-base", help="CDN base URL"
     ),
-    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompts"),
+    yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        envvar="MANGA_UPLOAD_YES",
+        help="Skip confirmation prompts (also skipped when stdin is not a TTY)",
+    ),
+    inventory: Optional[str] = typer.Option(
+        None,
+        "--inventory",
+        help="Read R2 file counts from an inventory CSV (.csv/.csv.gz) instead of listing the bucket",
+    ),
 ):
     """Upload manga to Convex database based on R2 bucket structure"""
 
@@ -201,7 +258,8 @@ def main(
                 f"Title: {title}\n"
                 f"Slug: {slug}\n"
                 f"Status: {status}\n"
-                f"CDN Base: {cdn_base}"
+                f"CDN Base: {cdn_base}\n"
+                f"R2 Source: {inventory or 'Bucket listing'}"
             ),
             title="Configuration",
             border_style="blue",
@@ -214,7 +272,10 @@ def main(
     console.print("\n[bold]Step 1: Scanning R2 Bucket Structure[/bold]")
 
     try:
-        volumes = list_volume_folders(slug)
+        if inventory:
+            volumes = read_inventory_volumes(Path(inventory), slug)
+        else:
+            volumes = list_volume_folders(slug)
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
@@ -265,7 +326,11 @@ def main(
         console.print(f"  Current volumes: {existing_volumes}")
         console.print(f"  Found in R2: {total_volumes} volumes")
 
-        if not yes:
+        if not yes and not sys.stdin.isatty():
+            console.print(
+                "[blue]Non-interactive input, appending without prompt[/blue]"
+            )
+        elif not yes:
             confirm = (
                 input(f"\nAppend {total_volumes} volumes to existing manga? [Y/n]: ")
                 .strip()
@@ -279,7 +344,7 @@ def main(
         manga_id = None
 
     # ============================================================================
-    # STEP 3: Create manga if needed and add volumes sequentially
+    # STEP 3: Create manga if needed and add all volumes
     # ============================================================================
     console.print("\n[bold]Step 3: Adding to Database[/bold]")
 
@@ -301,39 +366,31 @@ def main(
     else:
         console.print(f"[blue]Using existing manga ID: {manga_id}[/blue]")
 
-    # Add volumes sequentially
+    # Add all volumes in one mutation; existing volumes are skipped server-side
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        task = progress.add_task("Adding volumes...", total=len(volumes))
+        progress.add_task(f"Adding {total_volumes} volumes...", total=None)
 
-        for i, (vol_num, file_count) in enumerate(volumes, 1):
-            progress.update(
-                task, description=f"Adding Volume {vol_num}/{total_volumes}..."
-            )
+        try:
+            volume_ids = add_volumes(manga_id, volumes)
+        except Exception as e:
+            console.print(f"[red]  ✗ Adding volumes failed: {e}[/red]")
+            raise typer.Exit(1)
 
-            try:
-                # Check if volume already exists (we'll handle duplicates gracefully)
-                volume_id = add_volume(manga_id, vol_num, file_count)
-
-                if volume_id:
-                    added_volumes.append((vol_num, file_count, volume_id))
-                    console.print(
-                        f"[green]  ✓ Volume {vol_num}: {file_count} pages added[/green]"
-                    )
-                else:
-                    skipped_volumes.append((vol_num, file_count))
-                    console.print(
-                        f"[yellow]  ⊘ Volume {vol_num}: already exists, skipped[/yellow]"
-                    )
-
-            except Exception as e:
-                console.print(f"[red]  ✗ Volume {vol_num} failed: {e}[/red]")
-                raise typer.Exit(1)
-
-            progress.update(task, advance=1)
+    for (vol_num, file_count), volume_id in zip(volumes, volume_ids):
+        if volume_id:
+            added_volumes.append((vol_num, file_count, volume_id))
+            console.print(
+                f"[green]  ✓ Volume {vol_num}: {file_count} pages added[/green]"
+            )
+        else:
+            skipped_volumes.append((vol_num, file_count))
+            console.print(
+                f"[yellow]  ⊘ Volume {vol_num}: already exists, skipped[/yellow]"
+            )
 
     # ============================================================================
     # FINAL SUMMARY
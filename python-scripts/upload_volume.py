@@ -6,23 +6,46 @@ Usage:
     uv run upload_volume.py --volume 2 --title "Manga Title"
 """
 
+import functools
+import hashlib
+import io
+import json
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from typing import Iterator, Optional
+from dataclasses import astuple, dataclass
 
 import boto3
 import typer
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from dotenv import load_dotenv
 from PIL import Image
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.live import Live
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    BarColumn,
+    TaskProgressColumn,
+)
 from rich.layout import Layout
 from convex import ConvexClient
 
+# Optional: libvips decodes/encodes much faster than Pillow when installed
+try:
+    import pyvips
+
+    USE_VIPS = True
+except (ImportError, OSError):
+    USE_VIPS = False
+
 # Load environment variables
 load_dotenv()
 
@@ -37,18 +60,43 @@ if CONVEX_URL:
 else:
     convex_client = None
 
+# Convex query results keyed by function name: (fetched_at, result). They are
+# also persisted to QUERY_CACHE_DIR so consecutive runs can skip the round trip.
+_query_cache: dict[str, tuple[float, object]] = {}
+QUERY_CACHE_TTL = 300
+QUERY_CACHE_DIR = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "mangamanga"
+)
+
+# Concurrent page uploads; large pages are also split into parallel parts
+UPLOAD_WORKERS = 16
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+EXTRA_ARGS = {
+    "ContentType": "image/webp",
+    "CacheControl": "public, max-age=31536000, immutable",
+}
+
+
+_VOLUME_RE = re.compile(r"v(\d+)", re.IGNORECASE)
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
 
 def pad_number(num: int, length: int = 3) -> str:
     return str(num).zfill(length)
 
 
 def extract_volume_number(folder_name: str) -> int:
-    match = re.search(r"v(\d+)", folder_name, re.IGNORECASE)
+    match = _VOLUME_RE.search(folder_name)
     return int(match.group(1)) if match else 0
 
 
 def generate_slug(title: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", title.lower())
+    slug = _SLUG_RE.sub("-", title.lower())
     return slug.strip("-")
 
 
@@ -63,34 +111,252 @@ def find_volume_folder(source_path: Path, volume_num: int) -> Optional[Path]:
     return None
 
 
-def find_png_files(directory: Path) -> list[Path]:
-    return sorted(directory.rglob("*.png"))
+def iter_png_files(directory: str) -> Iterator[str]:
+    """Walk directory once with os.scandir, yielding PNG file paths as strings."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_png_files(entry.path)
+            elif entry.name.endswith(".png"):
+                yield entry.path
+
+
+def find_png_files(directory: Path) -> list[str]:
+    # Sort by path components, matching the order of sorted() on Path objects
+    png_files = iter_png_files(str(directory))
+    return sorted(png_files, key=lambda p: p.split(os.sep))
+
+
+# Pages below this many pixels are encoded with the faster method=4
+SMALL_PAGE_PIXELS = 1_000_000
+# Pages with at most this many colors (e.g. bitonal scans) are encoded lossless;
+# off by default. Anti-aliased grayscale pages use far more than FEW_TONE_COLORS
+# levels and are slower and larger as lossless WebP, so the limit is capped there.
+LOSSLESS_MAX_COLORS = 0
+FEW_TONE_COLORS = 16
+
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    """WebP encoder settings, passed as one picklable value to worker processes."""
+
+    quality: int = 85
+    # Fixed WebP method (0-6) for lossy pages; None picks 4 or 6 by page size
+    method: Optional[int] = None
+    small_page_pixels: int = SMALL_PAGE_PIXELS
+    lossless_max_colors: int = LOSSLESS_MAX_COLORS
+    # Save the cover (page 001 of volume 1, the manga's cover_url) lossless
+    cover_lossless: bool = False
+
+    def lossy_method(self, width: int, height: int, cover: bool = False) -> int:
+        # The cover is shown far more often than any other page, so it always
+        # gets the slowest, smallest method
+        if cover:
+            return 6
+        if self.method is not None:
+            return self.method
+        return 4 if width * height < self.small_page_pixels else 6
+
+
+def is_few_tone(img: Image.Image, max_colors: int) -> bool:
+    """Whether img has at most max_colors colors (capped at FEW_TONE_COLORS)."""
+    if not max_colors:
+        return False
+    return img.getcolors(maxcolors=min(max_colors, FEW_TONE_COLORS)) is not None
+
+
+def encode_page(png_path: str, options: EncodeOptions, cover: bool = False) -> bytes:
+    """Encode a single PNG page to WebP in memory (runs in a worker process).
+
+    Unless a method is fixed, small pages use method=4, since method=6 gains
+    little on them. The cover always uses method=6. With lossless_max_colors
+    set, pages with that few colors are saved lossless, as is the cover with
+    cover_lossless. Uses libvips when pyvips is installed, otherwise Pillow;
+    the color check always uses Pillow, so both paths pick the same pages.
+    """
+    lossless = cover and options.cover_lossless
+
+    if USE_VIPS:
+        if not lossless and options.lossless_max_colors:
+            with Image.open(png_path) as img:
+                lossless = is_few_tone(img, options.lossless_max_colors)
+        image = pyvips.Image.new_from_file(png_path, access="sequential")
+        if lossless:
+            return image.webpsave_buffer(lossless=True, effort=6)
+        effort = options.lossy_method(image.width, image.height, cover)
+        return image.webpsave_buffer(Q=options.quality, effort=effort)
+
+    buffer = io.BytesIO()
+    with Image.open(png_path) as img:
+        if lossless or is_few_tone(img, options.lossless_max_colors):
+            img.save(buffer, "WEBP", lossless=True, quality=100, method=6)
+        else:
+            img.save(
+                buffer,
+                "WEBP",
+                quality=options.quality,
+                method=options.lossy_method(*img.size, cover),
+            )
+    return buffer.getvalue()
+
+
+def convert_single_page(
+    png_path: str, output_file: str, options: EncodeOptions, cover: bool = False
+) -> None:
+    """Convert a single PNG page to a WebP file (runs in a worker process)."""
+    data = encode_page(png_path, options, cover)
+    with open(output_file, "wb") as f:
+        f.write(data)
 
 
-def convert_volume(
-    source_path: Path, output_path: Path, volume_num: int, quality: int
-) -> tuple[int, int]:
+def count_webp_files(directory: Path) -> int:
+    """Count the WebP files directly inside directory (0 if it does not exist)."""
+    try:
+        with os.scandir(directory) as it:
+            return sum(1 for entry in it if entry.name.endswith(".webp"))
+    except FileNotFoundError:
+        return 0
+
+
+def list_webp_files(directory: Path) -> list[str]:
+    """Return the sorted WebP file paths directly inside directory."""
+    try:
+        with os.scandir(directory) as it:
+            return sorted(entry.path for entry in it if entry.name.endswith(".webp"))
+    except FileNotFoundError:
+        return []
+
+
+# Per-volume record of which PNG and settings each WebP in the folder came from
+PAGE_CACHE_FILE = ".cache.json"
+
+
+def load_page_cache(volume_folder: str) -> dict[str, list]:
+    try:
+        with open(os.path.join(volume_folder, PAGE_CACHE_FILE), "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_page_cache(volume_folder: str, entries: dict[str, list]) -> None:
+    """Write the page cache atomically, so a crash never leaves half a file."""
+    cache_file = os.path.join(volume_folder, PAGE_CACHE_FILE)
+    with open(f"{cache_file}.tmp", "w") as f:
+        json.dump(entries, f)
+    os.replace(f"{cache_file}.tmp", cache_file)
+
+
+def check_page_cache(
+    pages: list[tuple[str, str]], options: EncodeOptions
+) -> tuple[dict[str, list], list[tuple[str, str]]]:
+    """Return the page cache entries for pages and the pages that need encoding.
+
+    A page is unchanged when its WebP exists and the cache shows it was encoded
+    from a PNG of the same size and mtime with the same settings.
+    """
+    cached = load_page_cache(os.path.dirname(pages[0][1]))
+    settings = astuple(options)
+    entries = {}
+    todo = []
+    for png_path, output_file in pages:
+        stat = os.stat(png_path)
+        entry = [png_path, stat.st_size, stat.st_mtime_ns, *settings]
+        name = os.path.basename(output_file)
+        entries[name] = entry
+        if cached.get(name) != entry or not os.path.exists(output_file):
+            todo.append((png_path, output_file))
+    return entries, todo
+
+
+def plan_volume_pages(
+    source_path: Path, output_path: Path, volume_num: int, create_folder: bool = True
+) -> list[tuple[str, str]]:
+    """Return (png_path, webp_path) pairs for a volume, creating its output folder.
+
+    Paths are plain strings, built once here rather than per step.
+    """
     png_files = find_png_files(source_path)
     if not png_files:
         raise ValueError(f"No PNG files found in {source_path}")
 
     volume_folder = output_path / f"volume-{pad_number(volume_num)}"
-    volume_folder.mkdir(parents=True, exist_ok=True)
+    if create_folder:
+        volume_folder.mkdir(parents=True, exist_ok=True)
 
-    converted = 0
-    errors = 0
+    base = f"{os.fspath(volume_folder)}{os.sep}"
+    return [
+        (png_path, f"{base}{i:03d}.webp") for i, png_path in enumerate(png_files, 1)
+    ]
 
-    for i, png_path in enumerate(png_files, 1):
-        output_file = volume_folder / f"{pad_number(i)}.webp"
-        try:
-            with Image.open(png_path) as img:
-                img.save(output_file, "WEBP", quality=quality, method=6)
-            converted += 1
-            console.print(f"Converting {png_path.name} → {output_file.name} ✅")
-        except Exception as e:
-            console.print(f"[red]Error converting {png_path}: {e}[/red]")
-            errors += 1
 
+def convert_volume(
+    source_path: Path,
+    output_path: Path,
+    volume_num: int,
+    options: EncodeOptions,
+    max_workers: Optional[int] = None,
+    reuse_unchanged: bool = True,
+) -> tuple[int, int]:
+    """Convert a volume's PNG pages to WebP.
+
+    With reuse_unchanged, pages whose PNG and settings match the last run are
+    kept as they are. They count as converted.
+    """
+    pages = plan_volume_pages(source_path, output_path, volume_num)
+    # Only volume 1's first page is used as the manga's cover image
+    cover_file = pages[0][1] if volume_num == 1 else None
+    volume_folder = os.path.dirname(pages[0][1])
+    entries, todo = check_page_cache(pages, options)
+    if not reuse_unchanged:
+        todo = pages
+
+    converted = len(pages) - len(todo)
+    errors = 0
+    if converted:
+        console.print(f"[blue]Reusing {converted} unchanged pages[/blue]")
+
+    # Only list pages that are final until this run finishes
+    todo_names = {os.path.basename(output_file) for _, output_file in todo}
+    save_page_cache(
+        volume_folder,
+        {name: entry for name, entry in entries.items() if name not in todo_names},
+    )
+
+    # method=6 encoding is CPU-bound, so spread pages across processes
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for png_path, output_file in todo:
+            future = executor.submit(
+                convert_single_page,
+                png_path,
+                output_file,
+                options,
+                cover=output_file == cover_file,
+            )
+            futures[future] = (png_path, output_file)
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Converting pages...", total=len(futures))
+
+            for future in as_completed(futures):
+                png_path, output_file = futures[future]
+                try:
+                    future.result()
+                    converted += 1
+                except Exception as e:
+                    console.print(f"[red]Error converting {png_path}: {e}[/red]")
+                    entries.pop(os.path.basename(output_file))
+                    errors += 1
+                progress.update(task, advance=1)
+
+    save_page_cache(volume_folder, entries)
     return converted, errors
 
 
@@ -102,55 +368,68 @@ def convert_volume(
 def arrow_key_menu(options: list[str], title: str, default_index: int = 0) -> int:
     """Display an interactive menu with arrow key navigation.
 
-    Returns the index of the selected option.
+    Returns the index of the selected option. Without a terminal to read
+    keys from, the default option is picked.
     """
+    import sys
+
+    if not sys.stdin.isatty():
+        return default_index
+
     selected = default_index
 
+    # Rendered rows; only the previously and newly selected rows change per key
+    header = (
+        f"[bold blue]{title}[/bold blue]\n\n"
+        "[dim]Use ↑/↓ arrow keys to navigate, Enter to select[/dim]\n\n"
+    )
+    rows = [f"  {option}" for option in options]
+
     def render_menu():
-        lines = [f"[bold blue]{title}[/bold blue]\n"]
-        lines.append("[dim]Use ↑/↓ arrow keys to navigate, Enter to select[/dim]\n")
+        return Panel(header + "\n".join(rows), border_style="blue")
 
-        for i, option in enumerate(options):
-            if i == selected:
-                lines.append(f"> [bold green]{option}[/bold green]")
-            else:
-                lines.append(f"  {option}")
+    def select(index: int) -> None:
+        nonlocal selected
+        rows[selected] = f"  {options[selected]}"
+        selected = index
+        rows[selected] = f"> [bold green]{options[selected]}[/bold green]"
 
-        return Panel("\n".join(lines), border_style="blue")
+    select(selected)
 
     with Live(render_menu(), console=console, auto_refresh=False) as live:
-        import sys
         import termios
         import tty
 
+        fd = sys.stdin.fileno()
+
         # Save terminal settings
-        old_settings = termios.tcgetattr(sys.stdin)
+        old_settings = termios.tcgetattr(fd)
 
         try:
             # Set terminal to raw mode for single key input
-            tty.setcbreak(sys.stdin.fileno())
+            tty.setcbreak(fd)
 
             while True:
-                live.update(render_menu())
-
-                # Read single key
-                key = sys.stdin.read(1)
-
-                # Arrow keys start with escape sequence
-                if key == "\x1b":
-                    seq = sys.stdin.read(2)
-                    if seq == "[A":  # Up arrow
-                        selected = (selected - 1) % len(options)
-                    elif seq == "[B":  # Down arrow
-                        selected = (selected + 1) % len(options)
-                elif key == "\n" or key == "\r":  # Enter
+                # Read a whole key press, including arrow escape sequences, at once
+                key = os.read(fd, 3)
+
+                if key == b"\x1b[A":  # Up arrow
+                    select((selected - 1) % len(options))
+                elif key == b"\x1b[B":  # Down arrow
+                    select((selected + 1) % len(options))
+                elif key in (b"\n", b"\r"):  # Enter
                     break
-                elif key == "q":  # Quit
+                elif key == b"q":  # Quit
                     return -1
+                else:
+                    continue
+
+                # Only redraw when the selection moved
+                live.update(render_menu(), refresh=True)
 
         finally:
             # Restore terminal settings
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
     return selected
 
@@ -195,8 +474,28 @@ def prompt_choice(question: str, options: list[str], default: str | None = None)
 # ============================================================================
 
 
+# Upload threads the shared R2 client's connection pool is sized for
+_r2_upload_workers = UPLOAD_WORKERS
+
+
+def set_r2_upload_workers(upload_workers: int) -> None:
+    """Size the shared R2 client for upload_workers threads.
+
+    main calls this before Step 1, so every later get_r2_client() call gets
+    the same client.
+    """
+    global _r2_upload_workers
+    _r2_upload_workers = upload_workers
+    get_r2_client.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
 def get_r2_client():
-    """Create and return R2 S3 client."""
+    """Return the shared R2 S3 client (built once per process).
+
+    The bucket listing, the skip check and the uploads of a run all reuse
+    one client and its connection pool.
+    """
     access_key = os.getenv("R2_ACCESS_KEY_ID")
     secret_key = os.getenv("R2_SECRET_ACCESS_KEY")
     bucket_url = os.getenv("R2_BUCKET_URL")
@@ -210,6 +509,12 @@ def get_r2_client():
         endpoint_url=bucket_url,
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
+        config=Config(
+            # One connection per upload thread, plus room for a multipart upload
+            max_pool_connections=_r2_upload_workers + TRANSFER_CONFIG.max_concurrency,
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
     )
 
 
@@ -222,16 +527,22 @@ def list_bucket_folders() -> list[str]:
     bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
 
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix="manga/", Delimiter="/"
+        paginator = s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket_name,
+            Prefix="manga/",
+            Delimiter="/",
+            PaginationConfig={"PageSize": 1000},
         )
 
         folders = []
-        for prefix in response.get("CommonPrefixes", []):
-            folder = prefix.get("Prefix", "")
-            match = re.search(r"manga/([^/]+)/", folder)
-            if match:
-                folders.append(match.group(1))
+        for page in pages:
+            for prefix in page.get("CommonPrefixes", []):
+                # Prefixes come back as "manga/{slug}/"
+                folder = prefix.get("Prefix", "")
+                slug = folder.removeprefix("manga/").rstrip("/")
+                if slug and "/" not in slug:
+                    folders.append(slug)
 
         return sorted(folders)
     except Exception as e:
@@ -274,43 +585,254 @@ def select_bucket_folder(default_slug: str) -> str:
     return selected.replace(" [default]", "")
 
 
+def list_existing_objects(s3_client, bucket_name: str, prefix: str) -> dict[str, int]:
+    """Return {key: size} for every object already in R2 under prefix."""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    pages = paginator.paginate(
+        Bucket=bucket_name, Prefix=prefix, PaginationConfig={"PageSize": 1000}
+    )
+    return {
+        obj["Key"]: obj["Size"] for page in pages for obj in page.get("Contents", [])
+    }
+
+
+def count_r2_pages(prefix: str) -> Optional[int]:
+    """Count the WebP pages in R2 under prefix, or None if R2 can't be listed."""
+    s3_client = get_r2_client()
+    if not s3_client:
+        return None
+
+    bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
+    try:
+        existing = list_existing_objects(s3_client, bucket_name, prefix)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not list {prefix} in R2: {e}[/yellow]")
+        return None
+    return sum(1 for key in existing if key.endswith(".webp"))
+
+
 def upload_to_r2(
-    webp_folder: Path, manga_slug: str, volume_num: int
-) -> tuple[int, int]:
-    """Upload WebP files to R2 bucket."""
+    webp_folder: Path,
+    manga_slug: str,
+    volume_num: int,
+    upload_workers: int = UPLOAD_WORKERS,
+) -> tuple[int, int, int]:
+    """Upload WebP files to R2 bucket.
+
+    Files already in R2 with the same size are skipped, so reruns only upload
+    what is missing. Returns (uploaded, skipped, errors).
+    """
     s3_client = get_r2_client()
     if not s3_client:
         raise ValueError("R2 credentials not configured")
 
     bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
-    webp_files = sorted(webp_folder.glob("*.webp"))
+    webp_files = list_webp_files(webp_folder)
 
     if not webp_files:
         raise ValueError(f"No WebP files found in {webp_folder}")
 
     uploaded = 0
+    skipped = 0
     errors = 0
     folder_prefix = f"manga/{manga_slug}/volume-{pad_number(volume_num)}/"
 
-    for webp_file in webp_files:
-        key = f"{folder_prefix}{webp_file.name}"
-        try:
-            s3_client.upload_file(
-                str(webp_file),
+    # One listing of the destination instead of a HEAD request per file
+    existing = list_existing_objects(s3_client, bucket_name, folder_prefix)
+    keys = [f"{folder_prefix}{os.path.basename(path)}" for path in webp_files]
+
+    # The boto3 client is thread-safe, so all upload threads share it
+    with ThreadPoolExecutor(max_workers=upload_workers) as executor:
+        futures = {}
+        for webp_file, key in zip(webp_files, keys):
+            if existing.get(key) == os.path.getsize(webp_file):
+                skipped += 1
+                continue
+
+            future = executor.submit(
+                s3_client.upload_file,
+                webp_file,
                 bucket_name,
                 key,
-                ExtraArgs={
-                    "ContentType": "image/webp",
-                    "CacheControl": "public, max-age=31536000, immutable",
-                },
+                ExtraArgs=EXTRA_ARGS,
+                Config=TRANSFER_CONFIG,
             )
-            uploaded += 1
-            console.print(f"Uploading {webp_file.name} ✅")
-        except Exception as e:
-            console.print(f"[red]Error uploading {webp_file}: {e}[/red]")
-            errors += 1
+            futures[future] = webp_file
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Uploading pages...", total=len(futures))
+
+            for future in as_completed(futures):
+                webp_file = futures[future]
+                try:
+                    future.result()
+                    uploaded += 1
+                except Exception as e:
+                    console.print(f"[red]Error uploading {webp_file}: {e}[/red]")
+                    errors += 1
+                progress.update(task, advance=1)
+
+    return uploaded, skipped, errors
+
+
+def convert_and_upload_volume(
+    source_path: Path,
+    output_path: Path,
+    volume_num: int,
+    manga_slug: str,
+    options: EncodeOptions,
+    max_workers: Optional[int] = None,
+    upload_workers: int = UPLOAD_WORKERS,
+    keep_local: bool = True,
+    reuse_unchanged: bool = True,
+) -> tuple[tuple[int, int], tuple[int, int, int]]:
+    """Convert a volume and upload each page as soon as it has been encoded.
+
+    Encoding runs on a process pool and uploads on a thread pool, so page N
+    uploads while page N+1 encodes. Without keep_local, encoded pages are
+    uploaded straight from memory and never written to the output folder.
+    With keep_local and reuse_unchanged, unchanged pages from the last run go
+    straight to the upload step, as in convert_volume.
+    Returns ((converted, convert_errors), (uploaded, skipped, upload_errors)),
+    matching convert_volume and upload_to_r2.
+    """
+    s3_client = get_r2_client()
+    if not s3_client:
+        raise ValueError("R2 credentials not configured")
 
-    return uploaded, errors
+    bucket_name = os.getenv("R2_BUCKET_NAME", "manga")
+    folder_prefix = f"manga/{manga_slug}/volume-{pad_number(volume_num)}/"
+    pages = plan_volume_pages(
+        source_path, output_path, volume_num, create_folder=keep_local
+    )
+
+    # One listing of the destination instead of a HEAD request per file
+    existing = list_existing_objects(s3_client, bucket_name, folder_prefix)
+
+    # Only volume 1's first page is used as the manga's cover image
+    cover_file = pages[0][1] if volume_num == 1 else None
+    volume_folder = os.path.dirname(pages[0][1])
+    entries: dict[str, list] = {}
+    todo = pages
+    if keep_local:
+        entries, todo = check_page_cache(pages, options)
+        if not reuse_unchanged:
+            todo = pages
+    todo_names = {os.path.basename(output_file) for _, output_file in todo}
+
+    if keep_local:
+        # Only list pages that are final until this run finishes
+        save_page_cache(
+            volume_folder,
+            {name: entry for name, entry in entries.items() if name not in todo_names},
+        )
+
+    converted = convert_errors = 0
+    uploaded = skipped = upload_errors = 0
+
+    with (
+        ProcessPoolExecutor(max_workers=max_workers) as convert_pool,
+        ThreadPoolExecutor(max_workers=upload_workers) as upload_pool,
+        Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+        ) as progress,
+    ):
+        convert_task = progress.add_task("Converting pages...", total=len(pages))
+        upload_task = progress.add_task("Uploading pages...", total=len(pages))
+
+        convert_futures = {}
+        for png_path, output_file in todo:
+            cover = output_file == cover_file
+            if keep_local:
+                future = convert_pool.submit(
+                    convert_single_page, png_path, output_file, options, cover
+                )
+            else:
+                future = convert_pool.submit(encode_page, png_path, options, cover)
+            convert_futures[future] = (png_path, output_file)
+        upload_futures = {}
+
+        def queue_upload(output_file: str, data: Optional[bytes]) -> None:
+            """Upload one page from output_file, or from data when it is given."""
+            nonlocal skipped
+            key = f"{folder_prefix}{os.path.basename(output_file)}"
+            size = os.path.getsize(output_file) if data is None else len(data)
+            if existing.get(key) == size:
+                skipped += 1
+                progress.update(upload_task, advance=1)
+                return
+
+            if data is None:
+                upload_future = upload_pool.submit(
+                    s3_client.upload_file,
+                    output_file,
+                    bucket_name,
+                    key,
+                    ExtraArgs=EXTRA_ARGS,
+                    Config=TRANSFER_CONFIG,
+                )
+            else:
+                upload_future = upload_pool.submit(
+                    s3_client.upload_fileobj,
+                    io.BytesIO(data),
+                    bucket_name,
+                    key,
+                    ExtraArgs=EXTRA_ARGS,
+                    Config=TRANSFER_CONFIG,
+                )
+            # Advance as each upload finishes, while encoding is still going
+            upload_future.add_done_callback(
+                lambda _: progress.update(upload_task, advance=1)
+            )
+            upload_futures[upload_future] = output_file
+
+        # Unchanged pages are already on disk, so they can start uploading now
+        reused = len(pages) - len(todo)
+        for _, output_file in pages:
+            if os.path.basename(output_file) not in todo_names:
+                queue_upload(output_file, None)
+        converted += reused
+        progress.update(convert_task, advance=reused)
+
+        # Hand each encoded page straight to the upload pool
+        for future in as_completed(convert_futures):
+            png_path, output_file = convert_futures[future]
+            progress.update(convert_task, advance=1)
+            try:
+                # WebP bytes without keep_local, None when written to output_file
+                data = future.result()
+                converted += 1
+            except Exception as e:
+                console.print(f"[red]Error converting {png_path}: {e}[/red]")
+                entries.pop(os.path.basename(output_file), None)
+                convert_errors += 1
+                progress.update(upload_task, advance=1)
+                continue
+
+            queue_upload(output_file, data)
+
+        for future in as_completed(upload_futures):
+            webp_file = upload_futures[future]
+            try:
+                future.result()
+                uploaded += 1
+            except Exception as e:
+                console.print(f"[red]Error uploading {webp_file}: {e}[/red]")
+                upload_errors += 1
+
+    if keep_local:
+        save_page_cache(volume_folder, entries)
+    return (converted, convert_errors), (uploaded, skipped, upload_errors)
 
 
 # ============================================================================
@@ -318,13 +840,61 @@ def upload_to_r2(
 # ============================================================================
 
 
-def get_manga_list() -> list[dict]:
+def _query_cache_file(name: str) -> Path:
+    # Keyed by deployment too, so dev and prod results never mix
+    deployment = hashlib.sha256((CONVEX_URL or "").encode()).hexdigest()[:12]
+    return QUERY_CACHE_DIR / f"{deployment}-{name.replace(':', '_')}.json"
+
+
+def cached_query(name: str, ttl: float = QUERY_CACHE_TTL, refresh: bool = False):
+    """Run a Convex query, reusing a result fetched less than ttl seconds ago.
+
+    Results are cached in memory and on disk, so the cache survives between runs.
+    With refresh, the query always runs and the cached result is replaced.
+    """
+    now = time.time()
+    cached = _query_cache.get(name)
+    if cached and now - cached[0] < ttl and not refresh:
+        return cached[1]
+
+    cache_file = _query_cache_file(name)
+    try:
+        fetched_at = cache_file.stat().st_mtime
+        if now - fetched_at < ttl and not refresh:
+            result = json.loads(cache_file.read_bytes())
+            _query_cache[name] = (fetched_at, result)
+            return result
+    except (OSError, ValueError):
+        pass
+
+    result = convex_client.query(name)
+    _query_cache[name] = (now, result)
+    try:
+        QUERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(result))
+    except (OSError, TypeError):
+        # The disk cache is only an optimisation
+        pass
+    return result
+
+
+def invalidate_query_cache() -> None:
+    """Drop cached query results after a mutation changed the data behind them."""
+    for name in list(_query_cache):
+        _query_cache_file(name).unlink(missing_ok=True)
+    _query_cache.clear()
+    if QUERY_CACHE_DIR.is_dir():
+        for cache_file in QUERY_CACHE_DIR.glob("*.json"):
+            cache_file.unlink(missing_ok=True)
+
+
+def get_manga_list(refresh: bool = False) -> list[dict]:
     """Get list of manga with volume counts from Convex."""
     if not convex_client:
         return []
 
     try:
-        return convex_client.query("manga:listMangaWithVolumeCounts")
+        return cached_query("manga:listMangaWithVolumeCounts", refresh=refresh)
     except Exception as e:
         console.print(f"[yellow]Warning: Could not fetch manga list: {e}[/yellow]")
         return []
@@ -361,6 +931,19 @@ def select_existing_manga() -> tuple[str | None, str | None]:
     return selected.get("_id"), selected.get("slug")
 
 
+def find_manga_by_slug(slug: str) -> str | None:
+    """Return the ID of the existing manga with this slug, if there is one.
+
+    On a miss the list is fetched again, since another script may have
+    created the manga after it was cached.
+    """
+    for refresh in (False, True):
+        for manga in get_manga_list(refresh=refresh):
+            if manga.get("slug") == slug:
+                return manga.get("_id")
+    return None
+
+
 def create_manga(title: str, slug: str, cover_url: str, total_volumes: int = 24) -> str:
     """Create new manga in Convex."""
     if not convex_client:
@@ -379,6 +962,7 @@ def create_manga(title: str, slug: str, cover_url: str, total_volumes: int = 24)
         )
         manga_id = result if isinstance(result, str) else str(result)
         console.print(f"[green]Created manga with ID: {manga_id}[/green]")
+        invalidate_query_cache()
         return manga_id
     except Exception as e:
         console.print(f"[red]Error creating manga: {e}[/red]")
@@ -401,6 +985,8 @@ def add_volume(manga_id: str, volume_number: int, page_count: int) -> str:
         )
         volume_id = result if isinstance(result, str) else str(result)
         console.print(f"[green]Added volume with ID: {volume_id}[/green]")
+        # The cached manga list includes volume counts
+        invalidate_query_cache()
         return volume_id
     except Exception as e:
         console.print(f"[red]Error adding volume: {e}[/red]")
@@ -434,16 +1020,97 @@ def main(
         None, "--output", "-o", help="Output directory"
     ),
     quality: int = typer.Option(85, "--quality", "-q", help="WebP quality (1-100)"),
+    method: Optional[int] = typer.Option(
+        None,
+        "--method",
+        "-m",
+        min=0,
+        max=6,
+        help="WebP method for lossy pages other than the cover (0 = fastest, "
+        "6 = smallest); default picks 4 or 6 by page size",
+    ),
+    max_workers: int = typer.Option(
+        os.cpu_count() or 4,
+        "--max-workers",
+        "-w",
+        help="Maximum parallel workers for PNG to WebP conversion",
+    ),
+    upload_workers: int = typer.Option(
+        UPLOAD_WORKERS, "--upload-workers", help="Maximum concurrent page uploads to R2"
+    ),
+    small_page_pixels: int = typer.Option(
+        SMALL_PAGE_PIXELS,
+        "--small-page-pixels",
+        help="Pages with fewer pixels than this use the faster WebP method 4",
+    ),
+    lossless_max_colors: int = typer.Option(
+        LOSSLESS_MAX_COLORS,
+        "--lossless-max-colors",
+        min=0,
+        max=FEW_TONE_COLORS,
+        help="Save pages with at most this many colors lossless, e.g. 2 for "
+        "bitonal scans (0 = off)",
+    ),
+    cover_lossless: bool = typer.Option(
+        False,
+        "--cover-lossless",
+        help="Save the cover page (volume 1, page 001) lossless; it always "
+        "uses WebP method 6",
+    ),
     skip_convert: bool = typer.Option(
         False, "--skip-convert", help="Skip PNG to WebP conversion"
     ),
+    reencode: bool = typer.Option(
+        False,
+        "--reencode",
+        help="Re-encode every page, even ones unchanged since the last conversion",
+    ),
+    pipeline: bool = typer.Option(
+        True,
+        "--pipeline/--no-pipeline",
+        help="Upload each page to R2 as soon as it is converted",
+    ),
+    local: bool = typer.Option(
+        True,
+        "--local/--no-local",
+        help="Keep converted WebP files in the output directory (--no-local "
+        "uploads them straight from memory; needs the pipelined upload)",
+    ),
+    yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        envvar="MANGA_UPLOAD_YES",
+        help="Don't prompt: use the options below, or the slug and defaults",
+    ),
+    no_bucket: bool = typer.Option(
+        False, "--skip-bucket", help="Skip the R2 upload and only update Convex"
+    ),
+    bucket_folder: Optional[str] = typer.Option(
+        None, "--bucket-folder", help="R2 folder to upload to (default: the slug)"
+    ),
+    mode: Optional[str] = typer.Option(
+        None,
+        "--mode",
+        help="new or append; with --yes, defaults to append to the manga "
+        "with this slug, creating it if missing",
+    ),
+    manga_id: Optional[str] = typer.Option(
+        None, "--manga-id", help="Convex ID of the manga to append the volume to"
+    ),
 ):
     """Upload a manga volume to R2 and Convex"""
 
+    if mode not in (None, "new", "append"):
+        console.print("[red]Error: --mode must be new or append[/red]")
+        raise typer.Exit(1)
+
     # Generate slug if not provided
     if not slug:
         slug = generate_slug(title)
 
+    volume_dir_name = f"volume-{volume:03d}"
+
     console.print(
         Panel(
             Text.from_markup(
@@ -457,24 +1124,40 @@ def main(
         )
     )
 
+    # One R2 client for the folder menu, the listings and every upload
+    set_r2_upload_workers(upload_workers)
+
     # ============================================================================
     # STEP 1: Ask about bucket upload
     # ============================================================================
     console.print("\n[bold]Step 1: R2 Bucket Upload[/bold]")
 
-    skip_bucket = prompt_yes_no(
-        "Skip uploading to bucket and just upload to database?", default=False
-    )
+    if yes or no_bucket:
+        skip_bucket = no_bucket
+    else:
+        skip_bucket = prompt_yes_no(
+            "Skip uploading to bucket and just upload to database?", default=False
+        )
 
     selected_slug = slug
 
     if not skip_bucket:
         # Select bucket folder
-        selected_slug = select_bucket_folder(slug)
+        if bucket_folder:
+            selected_slug = bucket_folder
+        elif not yes:
+            selected_slug = select_bucket_folder(slug)
         console.print(f"[green]Selected bucket folder: {selected_slug}[/green]")
     else:
         console.print("[blue]Skipping R2 bucket upload.[/blue]")
 
+    # Fetch the manga list Step 4 appends from while Steps 2 and 3 run
+    manga_list_future = None
+    if convex_client and mode != "new" and not manga_id:
+        prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        manga_list_future = prefetch_pool.submit(get_manga_list)
+        prefetch_pool.shutdown(wait=False)
+
     # ============================================================================
     # STEP 2: File conversion (always needed for page count)
     # ============================================================================
@@ -484,6 +1167,8 @@ def main(
         Path(source) if source else Path.home() / "Pictures/Manga/SteelBallRun/Volumes"
     )
     output_base = Path(output) if output else Path("./output") / selected_slug
+    volume_output = output_base / volume_dir_name
+    r2_volume_path = f"manga/{selected_slug}/{volume_dir_name}/"
 
     volume_folder = find_volume_folder(source_base, volume)
     if not volume_folder:
@@ -493,26 +1178,92 @@ def main(
     console.print(f"[green]Found volume folder: {volume_folder}[/green]")
 
     page_count = 0
+    encode_options = EncodeOptions(
+        quality=quality,
+        method=method,
+        small_page_pixels=small_page_pixels,
+        lossless_max_colors=lossless_max_colors,
+        cover_lossless=cover_lossless,
+    )
+
+    # Upload each page during conversion instead of in a separate Step 3
+    pipelined = pipeline and not skip_convert and not skip_bucket
 
-    if not skip_convert:
+    if not local and not pipelined:
+        console.print(
+            "[red]Error: --no-local needs conversion and the R2 upload with "
+            "--pipeline[/red]"
+        )
+        raise typer.Exit(1)
+
+    if pipelined:
+        console.print("\nConverting PNG to WebP and uploading to R2...")
+        (converted, errors), (uploaded, skipped, upload_errors) = (
+            convert_and_upload_volume(
+                volume_folder,
+                output_base,
+                volume,
+                selected_slug,
+                encode_options,
+                max_workers,
+                upload_workers,
+                keep_local=local,
+                reuse_unchanged=not reencode,
+            )
+        )
+        page_count = converted
+        console.print(f"[green]Converted {converted} pages ({errors} errors)[/green]")
+        console.print(
+            f"[green]Uploaded {uploaded} files "
+            f"({skipped} already in R2, {upload_errors} errors)[/green]"
+        )
+    elif not skip_convert:
         console.print("\nConverting PNG to WebP...")
-        converted, errors = convert_volume(volume_folder, output_base, volume, quality)
+        converted, errors = convert_volume(
+            volume_folder,
+            output_base,
+            volume,
+            encode_options,
+            max_workers,
+            reuse_unchanged=not reencode,
+        )
         page_count = converted
         console.print(f"[green]Converted {converted} pages ({errors} errors)[/green]")
     else:
         console.print("[yellow]Skipping conversion[/yellow]")
-        volume_output = output_base / f"volume-{pad_number(volume)}"
-        page_count = len(list(volume_output.glob("*.webp")))
+        page_count = count_webp_files(volume_output)
         console.print(f"[blue]Found {page_count} existing WebP files[/blue]")
 
+        # With no upload in this run, Convex should match what is already in R2
+        r2_page_count = count_r2_pages(r2_volume_path) if skip_bucket else None
+        if r2_page_count is not None:
+            console.print(f"[blue]Found {r2_page_count} pages in R2[/blue]")
+            # Never record an empty or truncated volume in Convex
+            if r2_page_count == 0:
+                console.print(
+                    f"[red]Error: No pages found in R2 under {r2_volume_path}[/red]"
+                )
+                raise typer.Exit(1)
+            if page_count and r2_page_count != page_count:
+                console.print(
+                    f"[red]Error: {page_count} local pages but {r2_page_count} "
+                    f"in R2 under {r2_volume_path}; upload the volume first[/red]"
+                )
+                raise typer.Exit(1)
+            page_count = r2_page_count
+
     # ============================================================================
-    # STEP 3: R2 Upload (if not skipped)
+    # STEP 3: R2 Upload (if not skipped or already pipelined in Step 2)
     # ============================================================================
-    if not skip_bucket:
+    if not skip_bucket and not pipelined:
         console.print("\n[bold]Step 3: Uploading to R2[/bold]")
-        volume_output = output_base / f"volume-{pad_number(volume)}"
-        uploaded, errors = upload_to_r2(volume_output, selected_slug, volume)
-        console.print(f"[green]Uploaded {uploaded} files ({errors} errors)[/green]")
+        uploaded, skipped, errors = upload_to_r2(
+            volume_output, selected_slug, volume, upload_workers
+        )
+        console.print(
+            f"[green]Uploaded {uploaded} files "
+            f"({skipped} already in R2, {errors} errors)[/green]"
+        )
 
     # ============================================================================
     # STEP 4: Convex Database Upload
@@ -524,19 +1275,30 @@ def main(
             "[red]Convex client not available. Skipping database update.[/red]"
         )
     else:
+        if manga_list_future:
+            # Fills the query cache that select_existing_manga reads from
+            manga_list_future.result()
+
         # Ask: new manga or append to existing?
-        choice = prompt_choice(
-            "Create new manga or append to existing?",
-            options=["new", "append"],
-            default="append",
-        )
+        if mode:
+            choice = mode
+        elif yes or manga_id:
+            choice = "append"
+        else:
+            choice = prompt_choice(
+                "Create new manga or append to existing?",
+                options=["new", "append"],
+                default="append",
+            )
 
-        manga_id = None
         final_slug = selected_slug
 
         if choice == "append":
-            # Select existing manga
-            manga_id, final_slug = select_existing_manga()
+            if not manga_id and yes:
+                manga_id = find_manga_by_slug(selected_slug)
+            elif not manga_id:
+                # Select existing manga
+                manga_id, final_slug = select_existing_manga()
 
             if manga_id is None:
                 console.print(
@@ -571,7 +1333,7 @@ def main(
     )
 
     if not skip_bucket:
-        summary_text += f"R2 Path: manga/{selected_slug}/volume-{pad_number(volume)}/\n"
+        summary_text += f"R2 Path: {r2_volume_path}\n"
 
     summary_text += f"\nFinal slug used: {selected_slug}"
 